@@ -13,19 +13,27 @@ class NodeType(Enum):
     AssignStatement = "AssignStatement"
     IfStatement = "IfStatement"
     WhileStatement = "WhileStatement"
+    ParallelStatement = "ParallelStatement"
+    ImportStatement = "ImportStatement"
 
     InfixExpression = "InfixExpression"
     CallExpression = "CallExpression"
+    IndexExpression = "IndexExpression"
 
     IntegerLiteral = "IntegerLiteral"
     FloatLiteral = "FloatLiteral"
     IdentifierLiteral = "IdentifierLiteral"
     BooleanLiteral = "BooleanLiteral"
+    StringLiteral = "StringLiteral"
+    ArrayLiteral = "ArrayLiteral"
 
     FunctionParameter = "FunctionParameter"
 
 
 class Node(ABC):
+    line: int = 0
+    column: int = 0
+
     @abstractmethod
     def type(self) -> NodeType:
         pass
@@ -203,6 +211,43 @@ class WhileStatement(Statement):
         }
 
 
+class ParallelStatement(Statement):
+    def __init__(self, variable: str = None, start: Expression = None, end: Expression = None,
+                 reduction: str = None, body: BlockStatement = None) -> None:
+        self.variable = variable
+        self.start = start
+        self.end = end
+        self.reduction = reduction
+        self.body = body
+
+    def type(self) -> NodeType:
+        return NodeType.ParallelStatement
+
+    def json(self) -> dict:
+        return {
+            "type": self.type().value,
+            "variable": self.variable,
+            "start": self.start.json(),
+            "end": self.end.json(),
+            "reduction": self.reduction,
+            "body": self.body.json()
+        }
+
+
+class ImportStatement(Statement):
+    def __init__(self, path: str = None) -> None:
+        self.path = path
+
+    def type(self) -> NodeType:
+        return NodeType.ImportStatement
+
+    def json(self) -> dict:
+        return {
+            "type": self.type().value,
+            "path": self.path
+        }
+
+
 class InfixExpression(Expression):
     def __init__(self, left_node: Expression, operator: str, right_node: Expression = None):
         self.left_node: Expression = left_node
@@ -237,6 +282,22 @@ class CallExpression(Expression):
         }
 
 
+class IndexExpression(Expression):
+    def __init__(self, array: Expression = None, index: Expression = None) -> None:
+        self.array = array
+        self.index = index
+
+    def type(self) -> NodeType:
+        return NodeType.IndexExpression
+
+    def json(self) -> dict:
+        return {
+            "type": self.type().value,
+            "array": self.array.json(),
+            "index": self.index.json()
+        }
+
+
 class IntegerLiteral(Expression):
     def __init__(self, value: int = None):
         self.value: int = value
@@ -279,6 +340,20 @@ class IdentifierLiteral(Expression):
         }
 
 
+class StringLiteral(Expression):
+    def __init__(self, value: str = None):
+        self.value: str = value
+
+    def type(self) -> NodeType:
+        return NodeType.StringLiteral
+
+    def json(self) -> dict:
+        return {
+            "type": self.type().value,
+            "value": self.value
+        }
+
+
 class BooleanLiteral(Expression):
     def __init__(self, value: bool = None):
         self.value: bool = value
@@ -291,3 +366,17 @@ class BooleanLiteral(Expression):
             "type": self.type().value,
             "value": self.value
         }
+
+
+class ArrayLiteral(Expression):
+    def __init__(self, elements: list[Expression] = None):
+        self.elements: list[Expression] = elements if elements is not None else []
+
+    def type(self) -> NodeType:
+        return NodeType.ArrayLiteral
+
+    def json(self) -> dict:
+        return {
+            "type": self.type().value,
+            "elements": [element.json() for element in self.elements]
+        }
@@ -0,0 +1,336 @@
+from AST import Node, NodeType, Expression
+from AST import FunctionStatement
+
+
+MATH_BUILTINS: dict[str, dict[tuple[str, ...], str]] = {
+    'sqrt': {('float',): 'float'},
+    'abs': {('int',): 'int', ('float',): 'float'},
+    'min': {('int', 'int'): 'int', ('float', 'float'): 'float'},
+    'max': {('int', 'int'): 'int', ('float', 'float'): 'float'},
+    'pow': {('float', 'float'): 'float', ('float', 'int'): 'float'},
+    'fma': {('float', 'float', 'float'): 'float'},
+    'floor': {('float',): 'float'},
+    'exp': {('float',): 'float'}
+}
+
+OUTPUT_BUILTINS: set[str] = {'print'}
+
+VECTOR_TYPES: dict[str, tuple[str, int]] = {
+    'int4': ('int', 4),
+    'int8': ('int', 8),
+    'float4': ('float', 4),
+    'float8': ('float', 8)
+}
+
+MAPPED_BUILTINS: dict[str, str] = {
+    'mmap_ints': 'int[]',
+    'mmap_floats': 'float[]'
+}
+
+BUILTINS: set[str] = {'len'} | set(MATH_BUILTINS) | OUTPUT_BUILTINS | set(VECTOR_TYPES) | set(MAPPED_BUILTINS)
+
+
+def builtin_return_type(name: str, arg_types: list[str]) -> tuple[str | None, str | None]:
+    overloads = MATH_BUILTINS[name]
+
+    return_type = overloads.get(tuple(arg_types))
+    if return_type is None:
+        expected = " or ".join(f"({', '.join(params)})" for params in overloads)
+        return None, f"{name}() expects {expected} but got ({', '.join(str(t) for t in arg_types)})"
+
+    return return_type, None
+
+
+def vector_constructor_error(name: str, arg_types: list[str]) -> str | None:
+    element_type, lanes = VECTOR_TYPES[name]
+    if len(arg_types) in (1, lanes) and all(t == element_type for t in arg_types):
+        return None
+
+    return (f"{name}() expects one {element_type} to splat or {lanes} {element_type} lanes "
+            f"but got ({', '.join(str(t) for t in arg_types)})")
+
+
+def vector_result_type(left_type: str | None, right_type: str | None) -> str | None:
+    if left_type in VECTOR_TYPES and (right_type == left_type or right_type == VECTOR_TYPES[left_type][0]):
+        return left_type
+    if right_type in VECTOR_TYPES and left_type == VECTOR_TYPES[right_type][0]:
+        return right_type
+    return None
+
+
+class FunctionInfo:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+        self.calls: set[str] = set()
+
+        self.reads_memory: bool = False
+        self.writes_memory: bool = False
+        self.writes_output: bool = False
+        self.recursive: bool = False
+        self.unwinds: bool = False
+
+        self.branches: int = 0
+
+    def pure(self) -> bool:
+        return not self.reads_memory and not self.writes_memory
+
+    def attributes(self) -> list[str]:
+        attrs: list[str] = []
+
+        if not self.unwinds:
+            attrs.append('nounwind')
+
+        if not self.recursive:
+            attrs.append('norecurse')
+
+        if self.pure():
+            attrs.append('readnone')
+        elif not self.writes_memory:
+            attrs.append('readonly')
+
+        return attrs
+
+    def json(self) -> dict:
+        return {
+            "name": self.name,
+            "calls": sorted(self.calls),
+            "reads_memory": self.reads_memory,
+            "writes_memory": self.writes_memory,
+            "writes_output": self.writes_output,
+            "recursive": self.recursive,
+            "unwinds": self.unwinds,
+            "branches": self.branches
+        }
+
+    @staticmethod
+    def from_json(data: dict) -> 'FunctionInfo':
+        info = FunctionInfo(data["name"])
+        info.calls = set(data["calls"])
+        info.reads_memory = data["reads_memory"]
+        info.writes_memory = data["writes_memory"]
+        info.writes_output = data["writes_output"]
+        info.recursive = data["recursive"]
+        info.unwinds = data["unwinds"]
+        info.branches = data["branches"]
+        return info
+
+    def __str__(self):
+        return f"FunctionInfo[{self.name} : {' '.join(self.attributes())}]"
+
+    def __repr__(self):
+        return str(self)
+
+
+class FunctionAnalyzer:
+    def __init__(self, node: FunctionStatement, known: dict[str, FunctionInfo]) -> None:
+        self.node = node
+        self.known = known
+
+        self.info: FunctionInfo = FunctionInfo(node.name.value)
+
+        self.external_arrays: set[str] = {p.name for p in node.parameters if p.value_type.endswith('[]')}
+
+    def analyze(self) -> FunctionInfo:
+        while True:
+            external = len(self.external_arrays)
+            self.info = FunctionInfo(self.node.name.value)
+            self.__visit(self.node.body)
+            if len(self.external_arrays) == external:
+                break
+
+        for name in self.info.calls:
+            if name == self.info.name:
+                self.info.recursive = True
+                continue
+
+            callee: FunctionInfo | None = self.known.get(name)
+            if callee is None:
+                self.info.reads_memory = True
+                self.info.writes_memory = True
+                self.info.recursive = True
+                self.info.unwinds = True
+                continue
+
+            self.info.reads_memory |= callee.reads_memory
+            self.info.writes_memory |= callee.writes_memory
+            self.info.writes_output |= callee.writes_output
+            self.info.unwinds |= callee.unwinds
+
+        return self.info
+
+    def __is_external(self, node: Expression) -> bool:
+        match node.type():
+            case NodeType.IdentifierLiteral:
+                return node.value in self.external_arrays
+            case NodeType.CallExpression:
+                return True
+        return False
+
+    def __visit(self, node: Node) -> None:
+        if node is None:
+            return
+
+        match node.type():
+            case NodeType.BlockStatement:
+                for stmt in node.statements:
+                    self.__visit(stmt)
+
+            case NodeType.ExpressionStatement:
+                self.__visit(node.expr)
+
+            case NodeType.VarStatement:
+                if self.__is_external(node.value):
+                    self.external_arrays.add(node.name.value)
+                self.__visit(node.value)
+
+            case NodeType.AssignStatement:
+                if node.ident.type() == NodeType.IndexExpression:
+                    if self.__is_external(node.ident.array):
+                        self.info.writes_memory = True
+                    self.__visit(node.ident.index)
+                elif self.__is_external(node.right_value):
+                    self.external_arrays.add(node.ident.value)
+                self.__visit(node.right_value)
+
+            case NodeType.ReturnStatement:
+                self.__visit(node.return_value)
+
+            case NodeType.IfStatement:
+                self.info.branches += 1
+                self.__visit(node.condition)
+                self.__visit(node.consequence)
+                self.__visit(node.alternative)
+
+            case NodeType.WhileStatement:
+                self.info.branches += 1
+                self.__visit(node.condition)
+                self.__visit(node.body)
+
+            case NodeType.ParallelStatement:
+                self.info.reads_memory = True
+                self.info.writes_memory = True
+                self.info.unwinds = True
+                self.__visit(node.start)
+                self.__visit(node.end)
+                self.__visit(node.body)
+
+            case NodeType.InfixExpression:
+                self.__visit(node.left_node)
+                self.__visit(node.right_node)
+
+            case NodeType.CallExpression:
+                if node.function.value in OUTPUT_BUILTINS:
+                    self.info.reads_memory = True
+                    self.info.writes_memory = True
+                    self.info.writes_output = True
+                elif node.function.value in MAPPED_BUILTINS:
+                    self.info.reads_memory = True
+                elif node.function.value not in BUILTINS:
+                    self.info.calls.add(node.function.value)
+                for arg in node.arguments:
+                    self.__visit(arg)
+
+            case NodeType.IndexExpression:
+                if self.__is_external(node.array):
+                    self.info.reads_memory = True
+                self.__visit(node.array)
+                self.__visit(node.index)
+
+            case NodeType.ArrayLiteral:
+                for element in node.elements:
+                    self.__visit(element)
+
+
+def analyze_function(node: FunctionStatement, known: dict[str, FunctionInfo]) -> FunctionInfo:
+    return FunctionAnalyzer(node, known).analyze()
+
+
+class NameScanner:
+    def __init__(self) -> None:
+        self.reads: set[str] = set()
+        self.writes: set[str] = set()
+        self.calls: set[str] = set()
+        self.declared: set[str] = set()
+        self.returns: bool = False
+        self.nested: bool = False
+
+    def scan(self, node: Node) -> 'NameScanner':
+        if node is None:
+            return self
+
+        match node.type():
+            case NodeType.BlockStatement:
+                for stmt in node.statements:
+                    self.scan(stmt)
+            case NodeType.ExpressionStatement:
+                self.scan(node.expr)
+            case NodeType.VarStatement:
+                self.declared.add(node.name.value)
+                self.scan(node.value)
+            case NodeType.AssignStatement:
+                if node.ident.type() == NodeType.IndexExpression:
+                    self.scan(node.ident)
+                else:
+                    self.writes.add(node.ident.value)
+                self.scan(node.right_value)
+            case NodeType.ReturnStatement:
+                self.returns = True
+                self.scan(node.return_value)
+            case NodeType.IfStatement:
+                self.scan(node.condition)
+                self.scan(node.consequence)
+                self.scan(node.alternative)
+            case NodeType.WhileStatement:
+                self.scan(node.condition)
+                self.scan(node.body)
+            case NodeType.ParallelStatement:
+                self.nested = True
+                self.scan(node.start)
+                self.scan(node.end)
+                self.scan(node.body)
+            case NodeType.InfixExpression:
+                self.scan(node.left_node)
+                self.scan(node.right_node)
+            case NodeType.CallExpression:
+                self.calls.add(node.function.value)
+                for arg in node.arguments:
+                    self.scan(arg)
+            case NodeType.IndexExpression:
+                self.scan(node.array)
+                self.scan(node.index)
+            case NodeType.ArrayLiteral:
+                for element in node.elements:
+                    self.scan(element)
+            case NodeType.IdentifierLiteral:
+                self.reads.add(node.value)
+
+        return self
+
+
+def scan_names(node: Node) -> NameScanner:
+    return NameScanner().scan(node)
+
+
+def parallel_errors(node: Node, function_info: dict[str, FunctionInfo]) -> list[str]:
+    names = scan_names(node.body)
+    errors = []
+
+    if names.returns:
+        errors.append("ret is not allowed inside a parallel loop")
+    if names.nested:
+        errors.append("Parallel loops cannot be nested")
+
+    if node.variable in names.writes | names.declared:
+        errors.append(f"Parallel loop variable {node.variable} cannot be assigned")
+
+    outer = sorted(names.writes - names.declared - {node.variable, node.reduction})
+    if len(outer) > 0:
+        errors.append(f"Parallel loop cannot assign to outer variables {', '.join(outer)}, use an array or reduce")
+
+    output = sorted(name for name in names.calls
+                    if name in OUTPUT_BUILTINS or (name in function_info and function_info[name].writes_output))
+    if len(output) > 0:
+        errors.append(f"Parallel loop cannot write output through {', '.join(output)}")
+
+    return errors
@@ -0,0 +1,102 @@
+from Engine import Engine
+from Target import TargetSpec
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+import asyncio
+import functools
+import os
+
+
+MAX_CONCURRENT: int = os.cpu_count() or 1
+
+
+def run_program(code: str, path: str | None, name: str, args: tuple, target: TargetSpec | None, opt_level: int,
+                backend: str) -> tuple[Any, bytes]:
+    engine = Engine(code=code, path=path, target=target, opt_level=opt_level, backend=backend)
+    try:
+        result = engine.call(name, *args)
+        return result, engine.output()
+    finally:
+        engine.close()
+
+
+def discard(cleanup: Callable, future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        cleanup(future.result())
+
+
+class AsyncEngine:
+    def __init__(self, executor: Executor = None, max_concurrent: int = MAX_CONCURRENT, timeout: float = None,
+                 target: TargetSpec = None, opt_level: int = 0, backend: str = 'jit') -> None:
+        self.own_executor = executor is None
+        self.executor: Executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_concurrent)
+        self.in_process = not isinstance(self.executor, ProcessPoolExecutor)
+
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.timeout = timeout
+
+        self.target = target
+        self.opt_level = opt_level
+        self.backend = backend
+
+    async def compile(self, code: str, path: str = None, timeout: float = None) -> Engine:
+        if not self.in_process:
+            raise TypeError("Compiled engines cannot leave a worker process, use run() with a process executor")
+
+        compile_engine = functools.partial(Engine, code=code, path=path, target=self.target, opt_level=self.opt_level,
+                                           backend=self.backend)
+        return await self.__submit(compile_engine, timeout, cleanup=Engine.close)
+
+    async def call(self, engine: Engine, name: str, *args: Any, timeout: float = None) -> Any:
+        if not self.in_process:
+            raise TypeError("Engines can only be called on a thread executor")
+
+        return await self.__submit(functools.partial(engine.call, name, *args), timeout)
+
+    async def run(self, code: str, name: str = 'main', *args: Any, path: str = None,
+                  timeout: float = None) -> tuple[Any, bytes]:
+        run = functools.partial(run_program, code, path, name, args, self.target, self.opt_level, self.backend)
+        return await self.__submit(run, timeout)
+
+    async def __submit(self, function: Callable, timeout: float | None, cleanup: Callable = None) -> Any:
+        loop = asyncio.get_running_loop()
+
+        await self.semaphore.acquire()
+        try:
+            future = self.executor.submit(function)
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+        future.add_done_callback(lambda _: self.__release(loop))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout if timeout is not None else self.timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if not future.cancel() and cleanup is not None:
+                future.add_done_callback(functools.partial(discard, cleanup))
+            raise
+
+    def __release(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self.semaphore.release)
+        except RuntimeError:
+            pass
+
+    def close(self) -> None:
+        if self.own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> 'AsyncEngine':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self):
+        return f"AsyncEngine[{type(self.executor).__name__} : {self.backend} : O{self.opt_level}]"
+
+    def __repr__(self):
+        return str(self)
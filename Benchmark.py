@@ -0,0 +1,196 @@
+from Engine import Engine, BACKENDS
+from Interpreter import Interpreter, INTERPRETER_BACKEND
+from Linker import UnitCache
+from Target import TargetSpec
+
+from typing import Callable
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import time
+
+import llvmlite
+import llvmlite.binding as llvm
+
+
+BENCHMARK_BACKENDS: list[str] = BACKENDS + [INTERPRETER_BACKEND]
+
+OPT_LEVELS: list[int] = [0, 1, 2, 3]
+
+WARMUP_SAMPLES: int = 5
+MEASURED_SAMPLES: int = 30
+MIN_SAMPLE_NS: int = 200_000
+TIMEOUT: float = 30.0
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    position = (len(sorted_samples) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "min_ns": ordered[0],
+        "p5_ns": percentile(ordered, 5),
+        "median_ns": percentile(ordered, 50),
+        "p95_ns": percentile(ordered, 95),
+        "p99_ns": percentile(ordered, 99),
+        "max_ns": ordered[-1],
+        "mean_ns": statistics.fmean(ordered),
+        "stdev_ns": statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    }
+
+
+def calibrate(cfunc: Callable, min_sample_ns: int) -> int:
+    calls = 1
+    while True:
+        st = time.perf_counter_ns()
+        for _ in range(calls):
+            cfunc()
+        elapsed = time.perf_counter_ns() - st
+
+        if elapsed >= min_sample_ns:
+            return calls
+        calls *= 2 if elapsed * 2 >= min_sample_ns else max(2, min_sample_ns // max(elapsed, 1))
+
+
+def measure(cfunc: Callable, warmup: int, samples: int, min_sample_ns: int) -> tuple[int, list[float]]:
+    calls = calibrate(cfunc, min_sample_ns)
+
+    timings = []
+    for i in range(warmup + samples):
+        st = time.perf_counter_ns()
+        for _ in range(calls):
+            cfunc()
+        elapsed = time.perf_counter_ns() - st
+
+        if i >= warmup:
+            timings.append(elapsed / calls)
+
+    return calls, timings
+
+
+def run_case(path: str, backend: str, opt_level: int, warmup: int, samples: int, min_sample_ns: int) -> dict:
+    with open(path, "r") as file:
+        code = file.read()
+
+    target = TargetSpec(opt=opt_level)
+    output = open(os.devnull, "wb")
+
+    st = time.perf_counter_ns()
+    if backend == INTERPRETER_BACKEND:
+        engine = Interpreter(code=code, path=path, opt_level=opt_level, output=output)
+    else:
+        engine = Engine(code=code, path=path, cache=UnitCache(target=target, use_disk=False), opt_level=opt_level,
+                        backend=backend, output=output)
+    compile_ns = time.perf_counter_ns() - st
+
+    cfunc = engine.function('main')
+    result = cfunc()
+
+    calls, timings = measure(cfunc, warmup, samples, min_sample_ns)
+
+    return {
+        "status": "ok",
+        "result": result,
+        "compile_ns": compile_ns,
+        "calls_per_sample": calls,
+        **summarize(timings)
+    }
+
+
+def run_isolated(case: tuple, timeout: float) -> dict:
+    pool = multiprocessing.Pool(processes=1)
+    try:
+        return pool.apply_async(run_case, case).get(timeout)
+    except multiprocessing.TimeoutError:
+        return {"status": "timeout"}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def benchmark(paths: list[str], backends: list[str] = None, opt_levels: list[int] = None,
+              warmup: int = WARMUP_SAMPLES, samples: int = MEASURED_SAMPLES, min_sample_ns: int = MIN_SAMPLE_NS,
+              timeout: float = TIMEOUT) -> dict:
+    backends = backends if backends is not None else BENCHMARK_BACKENDS
+    opt_levels = opt_levels if opt_levels is not None else OPT_LEVELS
+
+    results = []
+    for path in paths:
+        for backend in backends:
+            for opt_level in opt_levels:
+                case = (path, backend, opt_level, warmup, samples, min_sample_ns)
+                result = {"program": path, "backend": backend, "opt_level": opt_level}
+                result.update(run_isolated(case, timeout))
+                results.append(result)
+
+                print_result(result)
+
+    return {
+        "environment": {
+            "cpu": llvm.get_host_cpu_name(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "llvmlite": llvmlite.__version__
+        },
+        "config": {
+            "warmup": warmup,
+            "samples": samples,
+            "min_sample_ns": min_sample_ns,
+            "timeout": timeout
+        },
+        "results": results
+    }
+
+
+def print_result(result: dict) -> None:
+    line = f"{result['program']:<32} {result['backend']:<6} O{result['opt_level']} "
+
+    if result["status"] != "ok":
+        print(line + result["status"].upper() + (f": {result['error']}" if "error" in result else ""))
+        return
+
+    print(line + f"compile {result['compile_ns'] / 1e6:9.3f} ms  "
+                 f"median {result['median_ns']:12.1f} ns  "
+                 f"p5 {result['p5_ns']:12.1f} ns  "
+                 f"p95 {result['p95_ns']:12.1f} ns  "
+                 f"result {result['result']}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark compiled programs across backends and opt levels")
+    arg_parser.add_argument("programs", nargs="*", default=None)
+    arg_parser.add_argument("--backends", nargs="+", default=BENCHMARK_BACKENDS, choices=BENCHMARK_BACKENDS)
+    arg_parser.add_argument("--levels", nargs="+", type=int, default=OPT_LEVELS, choices=OPT_LEVELS)
+    arg_parser.add_argument("--warmup", type=int, default=WARMUP_SAMPLES)
+    arg_parser.add_argument("--samples", type=int, default=MEASURED_SAMPLES)
+    arg_parser.add_argument("--min-sample-ns", type=int, default=MIN_SAMPLE_NS)
+    arg_parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    arg_parser.add_argument("--output", default="benchmark.json")
+    args = arg_parser.parse_args()
+
+    paths = args.programs if args.programs else sorted(glob.glob("tests/*.txt"))
+
+    report = benchmark(paths, backends=args.backends, opt_levels=args.levels, warmup=args.warmup,
+                       samples=args.samples, min_sample_ns=args.min_sample_ns, timeout=args.timeout)
+
+    with open(args.output, "w") as report_file:
+        json.dump(report, report_file, indent=4)
+
+    print(f"{args.output} created")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,91 @@
 from llvmlite import ir
 
+from typing import Callable
+
+import os
 
 from AST import Node, NodeType, Program, Expression
 from AST import (ExpressionStatement, VarStatement, FunctionStatement, BlockStatement, ReturnStatement, AssignStatement,
-                 IfStatement, WhileStatement)
-from AST import InfixExpression, CallExpression
-from AST import IntegerLiteral, FloatLiteral, IdentifierLiteral, BooleanLiteral
+                 IfStatement, WhileStatement, ParallelStatement, ImportStatement)
+from AST import InfixExpression, CallExpression, IndexExpression
+from AST import IntegerLiteral, FloatLiteral, IdentifierLiteral, BooleanLiteral, StringLiteral, ArrayLiteral
 from AST import FunctionParameter
 
 from Environment import Environment
+from CompileTime import CompileTimeEvaluator
+from Analysis import FunctionInfo, analyze_function, scan_names, parallel_errors, BUILTINS, MATH_BUILTINS
+from Analysis import VECTOR_TYPES, MAPPED_BUILTINS, builtin_return_type, vector_constructor_error, vector_result_type
+from Profile import counters_name, counters_size, function_heat, branch_weights
+from Profile import timing_name, TIMING_CALLEE, TIMING_FIELDS
+from Output import OUTPUT_RECORDS, OUTPUT_BUFFER, OUTPUT_LENGTH, OUTPUT_FLUSH, OUTPUT_TAGS, print_function_name
+from Parallel import PARALLEL_RUN, PARALLEL_CHUNKS, parallel_function_name
+from MappedFile import MMAP_OPEN, MMAP_KINDS, mmap_function_name
+
+
+INTRINSICS: dict[tuple[str, tuple[str, ...]], str] = {
+    ('sqrt', ('float',)): 'llvm.sqrt.f32',
+    ('abs', ('int',)): 'llvm.abs.i32',
+    ('abs', ('float',)): 'llvm.fabs.f32',
+    ('min', ('int', 'int')): 'llvm.smin.i32',
+    ('min', ('float', 'float')): 'llvm.minnum.f32',
+    ('max', ('int', 'int')): 'llvm.smax.i32',
+    ('max', ('float', 'float')): 'llvm.maxnum.f32',
+    ('pow', ('float', 'float')): 'llvm.pow.f32',
+    ('pow', ('float', 'int')): 'llvm.powi.f32.i32',
+    ('fma', ('float', 'float', 'float')): 'llvm.fma.f32',
+    ('floor', ('float',)): 'llvm.floor.f32',
+    ('exp', ('float',)): 'llvm.exp.f32'
+}
+
+
+class FunctionAttributes(ir.FunctionAttributes):
+    _known = ir.FunctionAttributes._known | {'hot'}
+
+    def __init__(self, args=(), strings: dict[str, str] = None) -> None:
+        super().__init__(args)
+        self.strings: dict[str, str] = strings if strings else {}
+
+    def _to_list(self, ret_type) -> list[str]:
+        attrs = super()._to_list(ret_type)
+        attrs.extend(f'"{key}"="{value}"' for key, value in self.strings.items())
+        return attrs
+
+    def __bool__(self) -> bool:
+        return len(self) > 0 or len(self.strings) > 0
+
+
+class StreamedFunction(ir.Function):
+    def __init__(self, module: ir.Module, ftype: ir.FunctionType, name: str) -> None:
+        super().__init__(module, ftype, name)
+        self.text: str | None = None
+
+    def flush(self) -> None:
+        buf: list[str] = []
+        super().descr(buf)
+        self.text = "".join(buf)
+        self.blocks = []
+
+    def descr(self, buf: list[str]) -> None:
+        if self.text is not None:
+            buf.append(self.text)
+        else:
+            super().descr(buf)
 
 
 class Compiler:
-    def __init__(self) -> None:
+    def __init__(self, cpu_name: str = None, cpu_features: str = None, imports: dict = None, instrument: bool = False,
+                 profile: dict = None, debug: bool = False, filename: str = "<source>",
+                 runtime: Callable = None, evaluate_calls: bool = True, timing: bool = False,
+                 stream: bool = False) -> None:
         self.type_map: dict[str, ir.Type] = {
             'int': ir.IntType(32),
             'float': ir.FloatType(),
             'bool': ir.IntType(1)
         }
+        self.type_map['int[]'] = self.__array_type(self.type_map['int'])
+        self.type_map['float[]'] = self.__array_type(self.type_map['float'])
+        for name, (element_type, lanes) in VECTOR_TYPES.items():
+            self.type_map[name] = ir.VectorType(self.type_map[element_type], lanes)
 
         self.module: ir.Module = ir.Module('main')
 
@@ -27,13 +95,52 @@ class Compiler:
 
         self.errors: list[str] = []
 
+        self.signatures: dict[str, tuple[list[str], str]] = {}
+
+        self.function_info: dict[str, FunctionInfo] = {}
+
+        self.imports: dict = imports if imports else {}
+
+        self.runtime: Callable | None = runtime
+        self.runtime_unit = None
+
+        self.evaluator: CompileTimeEvaluator | None = CompileTimeEvaluator() if evaluate_calls else None
+
+        self.instrument = instrument
+        self.profile = profile
+
+        self.profile_counters: dict[str, int] = {}
+
+        self.timing = timing
+        self.timing_state: tuple[ir.GlobalVariable, ir.Value, ir.Value, bool] | None = None
+        self.counters: ir.GlobalVariable | None = None
+        self.function_profile: dict | None = None
+        self.branch_site: int = 0
+
+        self.debug = debug
+        self.debug_scope: ir.DIValue | None = None
+        if self.debug:
+            self.__initialize_debug_info(filename)
+
+        self.target_attributes: dict[str, str] = {}
+        if cpu_name:
+            self.target_attributes['target-cpu'] = cpu_name
+        if cpu_features:
+            self.target_attributes['target-features'] = cpu_features
+
         self.__initialize_builtins()
 
         self.counter: int = 0
+        self.line: int = 0
 
         self.breakpoints: list[ir.Block] = []
         self.continues: list[ir.Block] = []
 
+        self.string_constants: dict[str, ir.GlobalVariable] = {}
+        self.mapped_arrays: set[ir.Value] = set()
+
+        self.stream = stream
+
     def __initialize_builtins(self) -> None:
         def __init_booleans() -> tuple[ir.GlobalVariable, ir.GlobalVariable]:
             bool_type: ir.Type = self.type_map['bool']
@@ -41,10 +148,12 @@ class Compiler:
             true_var = ir.GlobalVariable(self.module, bool_type, 'true')
             true_var.initializer = ir.Constant(bool_type, 1)
             true_var.global_constant = True
+            true_var.linkage = 'internal'
 
             false_var = ir.GlobalVariable(self.module, bool_type, 'false')
             false_var.initializer = ir.Constant(bool_type, 0)
             false_var.global_constant = True
+            false_var.linkage = 'internal'
 
             return true_var, false_var
 
@@ -52,11 +161,73 @@ class Compiler:
         self.env.define('true', true_var, true_var.type)
         self.env.define('false', false_var, false_var.type)
 
+    def __initialize_debug_info(self, filename: str) -> None:
+        self.di_file = self.module.add_debug_info("DIFile", {
+            "filename": os.path.basename(filename),
+            "directory": os.path.dirname(os.path.abspath(filename))
+        })
+        self.di_compile_unit = self.module.add_debug_info("DICompileUnit", {
+            "language": ir.DIToken("DW_LANG_C"),
+            "file": self.di_file,
+            "producer": "coursework compiler",
+            "runtimeVersion": 0,
+            "isOptimized": True,
+            "emissionKind": ir.DIToken("LineTablesOnly")
+        }, is_distinct=True)
+        self.di_subroutine_type = self.module.add_debug_info("DISubroutineType", {
+            "types": self.module.add_metadata([])
+        })
+
+        self.module.add_named_metadata("llvm.dbg.cu", self.di_compile_unit)
+        self.module.add_named_metadata("llvm.module.flags", [ir.Constant(ir.IntType(32), 2), "Dwarf Version",
+                                                             ir.Constant(ir.IntType(32), 4)])
+        self.module.add_named_metadata("llvm.module.flags", [ir.Constant(ir.IntType(32), 2), "Debug Info Version",
+                                                             ir.Constant(ir.IntType(32), 3)])
+
+    def __debug_subprogram(self, name: str, line: int) -> ir.DIValue:
+        return self.module.add_debug_info("DISubprogram", {
+            "name": name,
+            "file": self.di_file,
+            "line": line,
+            "scopeLine": line,
+            "type": self.di_subroutine_type,
+            "unit": self.di_compile_unit,
+            "spFlags": ir.DIToken("DISPFlagDefinition")
+        }, is_distinct=True)
+
+    def __debug_location(self, line: int, column: int) -> ir.DIValue:
+        return self.module.add_debug_info("DILocation", {
+            "line": line,
+            "column": column,
+            "scope": self.debug_scope
+        })
+
+    def __array_type(self, element_type: ir.Type) -> ir.LiteralStructType:
+        return ir.LiteralStructType([element_type.as_pointer(), self.type_map['int']])
+
+    def __is_array_type(self, Type: ir.Type) -> bool:
+        return isinstance(Type, ir.LiteralStructType)
+
+    def __entry_alloca(self, Type: ir.Type) -> ir.AllocaInstr:
+        block: ir.Block = self.builder.block
+
+        self.builder.position_at_start(self.builder.function.entry_basic_block)
+        ptr = self.builder.alloca(Type)
+        self.builder.position_at_end(block)
+
+        return ptr
+
     def __increment_counter(self) -> int:
         self.counter += 1
         return self.counter
 
     def compile(self, node: Node) -> None:
+        if node.line > 0:
+            self.line = node.line
+
+        if self.debug_scope is not None and node.line > 0:
+            self.builder.debug_metadata = self.__debug_location(node.line, node.column)
+
         match node.type():
             case NodeType.Program:
                 self.__visit_program(node)
@@ -85,6 +256,12 @@ class Compiler:
             case NodeType.WhileStatement:
                 self.__visit_while_statement(node)
 
+            case NodeType.ParallelStatement:
+                self.__visit_parallel_statement(node)
+
+            case NodeType.ImportStatement:
+                self.__visit_import_statement(node)
+
             case NodeType.InfixExpression:
                 self.__visit_infix_expression(node)
 
@@ -104,10 +281,12 @@ class Compiler:
         value_type: str = node.value_type
 
         value, Type = self.__resolve_value(node=value)
+        if Type is None:
+            return
 
         if self.env.lookup(name) is None:
 
-            ptr = self.builder.alloca(Type)
+            ptr = self.__entry_alloca(Type)
             self.builder.store(value, ptr)
             self.env.define(name, ptr, Type)
 
@@ -115,6 +294,8 @@ class Compiler:
             ptr, _ = self.env.lookup(name)
             self.builder.store(value, ptr)
 
+        self.__track_mapped(ptr, node.value)
+
     def __visit_block_statement(self, node: BlockStatement) -> None:
         for stmt in node.statements:
             self.compile(stmt)
@@ -123,8 +304,75 @@ class Compiler:
         value: Expression = node.return_value
         value, Type = self.__resolve_value(value)
 
+        if self.timing_state is not None:
+            self.__exit_timing()
+
         self.builder.ret(value)
 
+    def __function_prototype(self, name: str, param_types: list[ir.Type], return_type: ir.Type) -> ir.Function:
+        arg_types: list[ir.Type] = []
+        for typ in param_types:
+            if self.__is_array_type(typ):
+                arg_types.extend(typ.elements)
+            else:
+                arg_types.append(typ)
+
+        fnty: ir.FunctionType = ir.FunctionType(return_type, arg_types)
+        func: ir.Function = StreamedFunction(self.module, fnty, name=name)
+        func.attributes = FunctionAttributes(strings=self.target_attributes)
+
+        return func
+
+    def __set_function_attributes(self, func: ir.Function, info: FunctionInfo) -> None:
+        for attr in info.attributes():
+            if (self.instrument or self.timing) and attr in ('readnone', 'readonly'):
+                continue
+            func.attributes.add(attr)
+        for arg in func.args:
+            if isinstance(arg.type, ir.PointerType):
+                arg.add_attribute('nocapture')
+
+    def __visit_import_statement(self, node: ImportStatement) -> None:
+        unit = self.imports.get(node.path)
+        if unit is None:
+            self.errors.append(f"Unresolved import {node.path}")
+            return
+
+        for name, (param_types, return_type) in unit.signatures.items():
+            if name in self.module.globals:
+                self.errors.append(f"Imported function {name} from {node.path} is already defined")
+                continue
+
+            self.__declare_external(name, param_types, return_type, unit.function_info[name])
+
+    def __declare_external(self, name: str, param_types: list[str], return_type: str, info: FunctionInfo) -> None:
+        func = self.__function_prototype(name, [self.type_map[t] for t in param_types], self.type_map[return_type])
+
+        self.function_info[name] = info
+        self.__set_function_attributes(func, info)
+
+        self.env.define(name, func, self.type_map[return_type])
+
+    def __declare_runtime_functions(self, caller: str, names: set[str]) -> bool:
+        missing = [n for n in sorted(names) if n != caller and n not in self.function_info and self.env.lookup(n) is None]
+        if len(missing) == 0 or self.runtime is None:
+            return False
+
+        if self.runtime_unit is None:
+            unit = self.runtime()
+            if not any(n in unit.signatures for n in missing):
+                return False
+            self.runtime_unit = unit
+
+        declared = False
+        for name in missing:
+            if name in self.runtime_unit.signatures:
+                param_types, return_type = self.runtime_unit.signatures[name]
+                self.__declare_external(name, param_types, return_type, self.runtime_unit.function_info[name])
+                declared = True
+
+        return declared
+
     def __visit_function_statement(self, node: FunctionStatement) -> None:
         name: str = node.name.value
         body: BlockStatement = node.body
@@ -136,8 +384,32 @@ class Compiler:
 
         return_type: ir.Type = self.type_map[node.return_type]
 
-        fnty: ir.FunctionType = ir.FunctionType(return_type, param_types)
-        func: ir.Function = ir.Function(self.module, fnty, name=name)
+        if self.__is_array_type(return_type):
+            self.errors.append(f"Function {name} cannot return an array")
+            return
+
+        if name in BUILTINS:
+            self.errors.append(f"Function {name} shadows a builtin")
+            return
+
+        if name in self.module.globals:
+            self.errors.append(f"Function {name} is already declared")
+            return
+
+        self.signatures[name] = ([p.value_type for p in params], node.return_type)
+
+        func: ir.Function = self.__function_prototype(name, param_types, return_type)
+
+        info: FunctionInfo = analyze_function(node, self.function_info)
+        if self.__declare_runtime_functions(name, info.calls):
+            info = analyze_function(node, self.function_info)
+        self.function_info[name] = info
+        if self.evaluator is not None:
+            self.evaluator.define(node, info)
+        self.__set_function_attributes(func, info)
+
+        previous_profile_state = (self.counters, self.function_profile, self.branch_site)
+        self.__set_profile_state(func, info)
 
         block: ir.Block = func.append_basic_block(f'{name}_entry')
 
@@ -145,10 +417,28 @@ class Compiler:
 
         self.builder = ir.IRBuilder(block)
 
+        previous_debug_scope = self.debug_scope
+        if self.debug:
+            self.debug_scope = self.__debug_subprogram(name, node.line)
+            func.set_metadata("dbg", self.debug_scope)
+            self.builder.debug_metadata = self.__debug_location(node.line, node.column)
+
+        if self.counters is not None:
+            self.__increment_profile_counter(ir.Constant(ir.IntType(32), 0))
+
+        previous_timing_state = self.timing_state
+        self.timing_state = self.__enter_timing(func, info.recursive) if self.timing else None
+
         params_ptr = []
-        for i, typ in enumerate(param_types):
+        args = iter(func.args)
+        for typ in param_types:
             ptr = self.builder.alloca(typ)
-            self.builder.store(func.args[i], ptr)
+            if self.__is_array_type(typ):
+                value = self.builder.insert_value(ir.Constant(typ, ir.Undefined), next(args), 0)
+                value = self.builder.insert_value(value, next(args), 1)
+                self.builder.store(value, ptr)
+            else:
+                self.builder.store(next(args), ptr)
             params_ptr.append(ptr)
 
 
@@ -168,18 +458,159 @@ class Compiler:
         self.env.define(name, func, return_type)
 
         self.builder = previous_builder
+        self.debug_scope = previous_debug_scope
+
+        self.counters, self.function_profile, self.branch_site = previous_profile_state
+        self.timing_state = previous_timing_state
+
+        self.mapped_arrays.clear()
+        if self.stream:
+            func.flush()
+
+    def __set_profile_state(self, func: ir.Function, info: FunctionInfo) -> None:
+        self.counters = None
+        self.function_profile = None
+        self.branch_site = 0
+
+        if self.instrument:
+            size: int = counters_size(info.branches)
+            counters_type = ir.ArrayType(ir.IntType(64), size)
+
+            self.counters = ir.GlobalVariable(self.module, counters_type, counters_name(func.name))
+            self.counters.initializer = ir.Constant(counters_type, None)
+            self.profile_counters[func.name] = size
+
+        if self.profile is not None:
+            self.function_profile = self.profile.get("functions", {}).get(func.name)
+
+            heat: str | None = function_heat(self.profile, func.name)
+            if heat is not None:
+                func.attributes.add(heat)
+
+            if self.function_profile is not None:
+                entry_count = self.module.add_metadata([ir.MetaDataString(self.module, "function_entry_count"),
+                                                        ir.Constant(ir.IntType(64), self.function_profile["entries"])])
+                func.set_metadata('prof', entry_count)
+
+    def __timing_callee(self) -> ir.GlobalVariable:
+        if TIMING_CALLEE in self.module.globals:
+            return self.module.globals[TIMING_CALLEE]
+
+        callee = ir.GlobalVariable(self.module, ir.IntType(64), TIMING_CALLEE)
+        callee.initializer = ir.Constant(ir.IntType(64), 0)
+        callee.linkage = 'linkonce_odr'
+        return callee
+
+    def __enter_timing(self, func: ir.Function, recursive: bool) -> tuple[ir.GlobalVariable, ir.Value, ir.Value, bool]:
+        i64 = ir.IntType(64)
+        table_type = ir.ArrayType(i64, len(TIMING_FIELDS))
+
+        table = ir.GlobalVariable(self.module, table_type, timing_name(func.name))
+        table.initializer = ir.Constant(table_type, None)
+
+        self.__add_to_table(table, 0, ir.Constant(i64, 1))
+        if recursive:
+            self.__add_to_table(table, 3, ir.Constant(i64, 1))
+
+        saved = self.builder.load(self.__timing_callee())
+        start = self.builder.call(self.__intrinsic('llvm.readcyclecounter', i64, []), [])
+
+        return table, saved, start, recursive
+
+    def __exit_timing(self) -> None:
+        table, saved, start, recursive = self.timing_state
+        callee = self.__timing_callee()
+        i64 = ir.IntType(64)
+
+        elapsed = self.builder.sub(self.builder.call(self.__intrinsic('llvm.readcyclecounter', i64, []), []), start)
+        inner = self.builder.sub(self.builder.load(callee), saved)
+
+        inclusive = elapsed
+        if recursive:
+            depth = self.__add_to_table(table, 3, ir.Constant(i64, -1))
+            outermost = self.builder.icmp_unsigned('==', depth, ir.Constant(i64, 0))
+            inclusive = self.builder.select(outermost, elapsed, ir.Constant(i64, 0))
+
+        self.__add_to_table(table, 1, inclusive)
+        self.__add_to_table(table, 2, self.builder.sub(elapsed, inner))
+        self.builder.store(self.builder.add(saved, elapsed), callee)
+
+    def __add_to_table(self, table: ir.GlobalVariable, field: int, value: ir.Value) -> ir.Value:
+        i32 = ir.IntType(32)
+        ptr = self.builder.gep(table, [ir.Constant(i32, 0), ir.Constant(i32, field)], inbounds=True)
+        total = self.builder.add(self.builder.load(ptr), value)
+        self.builder.store(total, ptr)
+        return total
+
+    def __increment_profile_counter(self, index: ir.Value) -> None:
+        ptr = self.builder.gep(self.counters, [ir.Constant(ir.IntType(32), 0), index], inbounds=True)
+        self.builder.store(self.builder.add(self.builder.load(ptr), ir.Constant(ir.IntType(64), 1)), ptr)
+
+    def __new_branch_site(self) -> int:
+        site: int = self.branch_site
+        self.branch_site += 1
+        return site
+
+    def __count_branch(self, site: int, test: ir.Value) -> None:
+        if self.counters is None:
+            return
+
+        index = self.builder.select(test, ir.Constant(ir.IntType(32), 1 + 2 * site),
+                                    ir.Constant(ir.IntType(32), 2 + 2 * site))
+        self.__increment_profile_counter(index)
+
+    def __set_branch_weights(self, branch: ir.Instruction, site: int) -> None:
+        if self.function_profile is None or site >= len(self.function_profile["branches"]):
+            return
+
+        weights = branch_weights(*self.function_profile["branches"][site])
+        if weights is not None:
+            branch.set_weights(weights)
 
     def __visit_assign_statement(self, node: AssignStatement) -> None:
-        name: str = node.ident.value
         value: Expression = node.right_value
 
         value, Type = self.__resolve_value(value)
 
+        if node.ident.type() == NodeType.IndexExpression:
+            if node.ident.array.type() == NodeType.IdentifierLiteral:
+                record = self.env.lookup(node.ident.array.value)
+                if record is not None and isinstance(record[1], ir.VectorType):
+                    self.__assign_lane(record, node.ident.index, value)
+                    return
+
+                if record is not None and record[0] in self.mapped_arrays:
+                    self.errors.append(f"Array {node.ident.array.value} is a read-only mapped file")
+                    return
+
+            ptr, _ = self.__index_pointer(node.ident)
+            if ptr is not None:
+                self.builder.store(value, ptr)
+            return
+
+        name: str = node.ident.value
+
         if self.env.lookup(name) is None:
             self.errors.append(f"Identifier {name} has not been declared before re-assignment")
         else:
             ptr, _ = self.env.lookup(name)
             self.builder.store(value, ptr)
+            self.__track_mapped(ptr, node.right_value)
+
+    def __track_mapped(self, ptr: ir.Value, value: Expression) -> None:
+        if self.__is_mapped(value):
+            self.mapped_arrays.add(ptr)
+        else:
+            self.mapped_arrays.discard(ptr)
+
+    def __is_mapped(self, node: Expression) -> bool:
+        match node.type():
+            case NodeType.CallExpression:
+                return node.function.value in MAPPED_BUILTINS
+            case NodeType.IdentifierLiteral:
+                record = self.env.lookup(node.value)
+                return record is not None and record[0] in self.mapped_arrays
+        return False
 
     def __visit_if_statement(self, node: IfStatement) -> None:
         condition = node.condition
@@ -188,6 +619,11 @@ class Compiler:
 
         test, _ = self.__resolve_value(condition)
 
+        site: int = self.__new_branch_site()
+        self.__count_branch(site, test)
+
+        block: ir.Block = self.builder.block
+
         if alternative is None:
             with self.builder.if_then(test):
                 self.compile(consequence)
@@ -198,6 +634,8 @@ class Compiler:
                 with otherwise:
                     self.compile(alternative)
 
+        self.__set_branch_weights(block.terminator, site)
+
     def __visit_while_statement(self, node: WhileStatement) -> None:
         condition: Expression = node.condition
         body: BlockStatement = node.body
@@ -211,7 +649,10 @@ class Compiler:
         self.breakpoints.append(while_loop_otherwise)
         self.continues.append(while_loop_entry)
 
-        self.builder.cbranch(test, while_loop_entry, while_loop_otherwise)
+        site: int = self.__new_branch_site()
+        self.__count_branch(site, test)
+
+        entry_branch = self.builder.cbranch(test, while_loop_entry, while_loop_otherwise)
 
         self.builder.position_at_start(while_loop_entry)
 
@@ -219,18 +660,212 @@ class Compiler:
 
         test, _ = self.__resolve_value(condition)
 
-        self.builder.cbranch(test, while_loop_entry, while_loop_otherwise)
+        self.__count_branch(site, test)
+
+        loop_branch = self.builder.cbranch(test, while_loop_entry, while_loop_otherwise)
         self.builder.position_at_start(while_loop_otherwise)
 
+        self.__set_branch_weights(entry_branch, site)
+        self.__set_branch_weights(loop_branch, site)
+
         self.breakpoints.pop()
         self.continues.pop()
 
+    def __visit_parallel_statement(self, node: ParallelStatement) -> None:
+        errors = parallel_errors(node, self.function_info)
+
+        reduction = None
+        if node.reduction is not None:
+            reduction = self.env.lookup(node.reduction)
+            if reduction is None:
+                errors.append(f"Reduction variable {node.reduction} has not been declared")
+            elif self.__type_name(reduction[1]) not in ('int', 'float'):
+                errors.append(f"Reduction variable {node.reduction} must be an int or a float")
+
+        if len(errors) > 0:
+            self.errors.extend(errors)
+            return
+
+        i32 = self.type_map['int']
+        i8_ptr = ir.IntType(8).as_pointer()
+
+        start, start_type = self.__resolve_value(node.start)
+        end, end_type = self.__resolve_value(node.end)
+        if start_type != i32 or end_type != i32:
+            self.errors.append(f"Parallel loop bounds of {node.variable} must be ints")
+            return
+
+        names = scan_names(node.body)
+        captures: list[tuple[str, ir.Type]] = []
+        functions: list[tuple[str, ir.Function, ir.Type]] = []
+        for name in sorted((names.reads | names.calls) - names.declared - {node.variable, node.reduction}):
+            record = self.env.lookup(name)
+            if record is None:
+                continue
+            if isinstance(record[0], ir.Function):
+                functions.append((name, *record))
+            elif isinstance(record[0], ir.AllocaInstr):
+                captures.append((name, record[1]))
+
+        context = ir.Constant(i8_ptr, None)
+        context_type = ir.LiteralStructType([Type for _, Type in captures])
+        if len(captures) > 0:
+            storage = self.__entry_alloca(context_type)
+            for i, (name, _) in enumerate(captures):
+                ptr, _ = self.env.lookup(name)
+                self.builder.store(self.builder.load(ptr), self.builder.gep(
+                    storage, [ir.Constant(i32, 0), ir.Constant(i32, i)], inbounds=True))
+            context = self.builder.bitcast(storage, i8_ptr)
+
+        body = self.__parallel_body(node, context_type, captures, functions, reduction)
+
+        partials = self.__entry_alloca(ir.ArrayType(ir.IntType(64), PARALLEL_CHUNKS))
+        partials_ptr = self.builder.bitcast(partials, i8_ptr)
+        count = self.__entry_alloca(i32)
+
+        runner = self.builder.load(self.__parallel_runner(body.type))
+        serial = self.builder.icmp_unsigned('==', runner, ir.Constant(runner.type, None))
+        with self.builder.if_else(serial) as (inline, threaded):
+            with inline:
+                self.builder.call(body, [context, start, end, partials_ptr])
+                self.builder.store(ir.Constant(i32, 1), count)
+            with threaded:
+                self.builder.store(self.builder.call(runner, [body, context, start, end, partials_ptr]), count)
+
+        if reduction is None:
+            return
+
+        ptr, Type = reduction
+        chunks = self.builder.load(count)
+
+        index = self.__entry_alloca(i32)
+        self.builder.store(ir.Constant(i32, 0), index)
+
+        sum_cond = self.builder.append_basic_block(f"parallel_sum_cond_{self.__increment_counter()}")
+        sum_body = self.builder.append_basic_block(f"parallel_sum_body_{self.counter}")
+        sum_end = self.builder.append_basic_block(f"parallel_sum_end_{self.counter}")
+
+        self.builder.branch(sum_cond)
+        self.builder.position_at_end(sum_cond)
+        k = self.builder.load(index)
+        self.builder.cbranch(self.builder.icmp_signed('<', k, chunks), sum_body, sum_end)
+
+        self.builder.position_at_end(sum_body)
+        slot = self.builder.gep(partials, [ir.Constant(i32, 0), k], inbounds=True)
+        partial = self.builder.load(self.builder.bitcast(slot, Type.as_pointer()))
+        total = self.builder.load(ptr)
+        total = self.builder.fadd(total, partial) if isinstance(Type, ir.FloatType) else self.builder.add(total, partial)
+        self.builder.store(total, ptr)
+        self.builder.store(self.builder.add(k, ir.Constant(i32, 1)), index)
+        self.builder.branch(sum_cond)
+
+        self.builder.position_at_end(sum_end)
+
+    def __parallel_body(self, node: ParallelStatement, context_type: ir.LiteralStructType,
+                        captures: list[tuple[str, ir.Type]], functions: list[tuple[str, ir.Function, ir.Type]],
+                        reduction: tuple[ir.Value, ir.Type] | None) -> ir.Function:
+        i32 = self.type_map['int']
+        i8_ptr = ir.IntType(8).as_pointer()
+
+        name = parallel_function_name(self.builder.function.name, self.__increment_counter())
+        func = StreamedFunction(self.module, ir.FunctionType(ir.VoidType(), [i8_ptr, i32, i32, i8_ptr]), name=name)
+        func.linkage = 'internal'
+        func.attributes = FunctionAttributes(strings=self.target_attributes)
+        func.attributes.add('nounwind')
+        context_arg, start_arg, end_arg, partial_arg = func.args
+
+        previous_state = (self.builder, self.env, self.debug_scope, self.counters, self.function_profile,
+                          self.branch_site, self.timing_state)
+
+        self.builder = ir.IRBuilder(func.append_basic_block('parallel_entry'))
+        self.counters, self.function_profile, self.branch_site, self.timing_state = None, None, 0, None
+
+        if self.debug:
+            self.debug_scope = self.__debug_subprogram(name, node.line)
+            func.set_metadata("dbg", self.debug_scope)
+            self.builder.debug_metadata = self.__debug_location(node.line, node.column)
+
+        mapped = {capture for capture, _ in captures if self.env.lookup(capture)[0] in self.mapped_arrays}
+
+        root = self.env
+        while root.parent is not None:
+            root = root.parent
+
+        self.env = Environment(parent=root)
+        for function_name, function, return_type in functions:
+            self.env.define(function_name, function, return_type)
+
+        if len(captures) > 0:
+            context = self.builder.bitcast(context_arg, context_type.as_pointer())
+            for i, (capture, Type) in enumerate(captures):
+                ptr = self.builder.alloca(Type)
+                value = self.builder.load(self.builder.gep(context, [ir.Constant(i32, 0), ir.Constant(i32, i)],
+                                                           inbounds=True))
+                self.builder.store(value, ptr)
+                self.env.define(capture, ptr, Type)
+                if capture in mapped:
+                    self.mapped_arrays.add(ptr)
+
+        index = self.builder.alloca(i32)
+        self.builder.store(start_arg, index)
+        self.env.define(node.variable, index, i32)
+
+        accumulator = None
+        if reduction is not None:
+            Type = reduction[1]
+            accumulator = self.builder.alloca(Type)
+            self.builder.store(ir.Constant(Type, 0), accumulator)
+            self.env.define(node.reduction, accumulator, Type)
+
+        loop_cond = func.append_basic_block('parallel_cond')
+        loop_body = func.append_basic_block('parallel_body')
+        loop_end = func.append_basic_block('parallel_end')
+
+        self.builder.branch(loop_cond)
+        self.builder.position_at_end(loop_cond)
+        self.builder.cbranch(self.builder.icmp_signed('<', self.builder.load(index), end_arg), loop_body, loop_end)
+
+        self.builder.position_at_end(loop_body)
+        self.compile(node.body)
+        self.builder.store(self.builder.add(self.builder.load(index), ir.Constant(i32, 1)), index)
+        self.builder.branch(loop_cond)
+
+        self.builder.position_at_end(loop_end)
+        if accumulator is not None:
+            self.builder.store(self.builder.load(accumulator),
+                               self.builder.bitcast(partial_arg, accumulator.type))
+        self.builder.ret_void()
+
+        (self.builder, self.env, self.debug_scope, self.counters, self.function_profile,
+         self.branch_site, self.timing_state) = previous_state
+
+        if self.stream:
+            func.flush()
+
+        return func
+
+    def __parallel_runner(self, body_type: ir.PointerType) -> ir.GlobalVariable:
+        if PARALLEL_RUN in self.module.globals:
+            return self.module.globals[PARALLEL_RUN]
+
+        i32 = self.type_map['int']
+        i8_ptr = ir.IntType(8).as_pointer()
+        runner_type = ir.FunctionType(i32, [body_type, i8_ptr, i32, i32, i8_ptr]).as_pointer()
+
+        runner = ir.GlobalVariable(self.module, runner_type, PARALLEL_RUN)
+        runner.initializer = ir.Constant(runner_type, None)
+        runner.linkage = 'linkonce_odr'
+        return runner
+
     def __visit_infix_expression(self, node: InfixExpression) -> None:
         operator: str = node.operator
 
         left_value, left_type = self.__resolve_value(node.left_node)
         right_value, right_type = self.__resolve_value(node.right_node)
 
+        if isinstance(left_type, ir.VectorType) or isinstance(right_type, ir.VectorType):
+            return self.__visit_vector_infix(operator, left_value, left_type, right_value, right_type)
+
         value = None
         Type = None
         if isinstance(right_type, ir.IntType) and isinstance(left_type, ir.IntType):
@@ -295,6 +930,79 @@ class Compiler:
 
         return value, Type
 
+    def __visit_vector_infix(self, operator: str, left_value: ir.Value, left_type: ir.Type, right_value: ir.Value,
+                             right_type: ir.Type) -> tuple[ir.Value | None, ir.Type | None]:
+        left_name, right_name = self.__type_name(left_type), self.__type_name(right_type)
+
+        vector_name = vector_result_type(left_name, right_name)
+        if vector_name is None or operator not in ('+', '-', '*', '/'):
+            self.errors.append(f"Unsupported operation {left_name} {operator} {right_name}")
+            return None, None
+
+        Type: ir.VectorType = self.type_map[vector_name]
+        if left_type != Type:
+            left_value = self.__splat(left_value, Type)
+        if right_type != Type:
+            right_value = self.__splat(right_value, Type)
+
+        if isinstance(Type.element, ir.FloatType):
+            operations = {'+': self.builder.fadd, '-': self.builder.fsub, '*': self.builder.fmul,
+                          '/': self.builder.fdiv}
+        else:
+            operations = {'+': self.builder.add, '-': self.builder.sub, '*': self.builder.mul,
+                          '/': self.builder.sdiv}
+
+        return operations[operator](left_value, right_value), Type
+
+    def __splat(self, value: ir.Value, Type: ir.VectorType) -> ir.Value:
+        if isinstance(value, ir.Constant):
+            return ir.Constant(Type, [value.constant] * Type.count)
+
+        i32 = self.type_map['int']
+        lane = self.builder.insert_element(ir.Constant(Type, ir.Undefined), value, ir.Constant(i32, 0))
+        mask = ir.Constant(ir.VectorType(i32, Type.count), [0] * Type.count)
+        return self.builder.shuffle_vector(lane, ir.Constant(Type, ir.Undefined), mask)
+
+    def __visit_vector_constructor(self, name: str, args: list[ir.Value],
+                                   types: list[ir.Type]) -> tuple[ir.Value | None, ir.Type | None]:
+        error = vector_constructor_error(name, [self.__type_name(typ) for typ in types])
+        if error is not None:
+            self.errors.append(error)
+            return None, None
+
+        Type: ir.VectorType = self.type_map[name]
+        if len(args) == 1:
+            return self.__splat(args[0], Type), Type
+
+        if all(isinstance(arg, ir.Constant) for arg in args):
+            return ir.Constant(Type, [arg.constant for arg in args]), Type
+
+        vector = ir.Constant(Type, ir.Undefined)
+        for i, arg in enumerate(args):
+            vector = self.builder.insert_element(vector, arg, ir.Constant(self.type_map['int'], i))
+        return vector, Type
+
+    def __lane_index(self, index: Expression, Type: ir.VectorType) -> ir.Value | None:
+        lane, lane_type = self.__resolve_value(index)
+        if lane_type != self.type_map['int']:
+            self.errors.append("Vector lane index must be an int")
+            return None
+
+        if isinstance(lane, ir.Constant) and not 0 <= lane.constant < Type.count:
+            self.errors.append(f"Lane {lane.constant} is out of range for {self.__type_name(Type)}")
+            return None
+
+        return lane
+
+    def __assign_lane(self, record: tuple[ir.Value, ir.VectorType], index: Expression, value: ir.Value) -> None:
+        ptr, Type = record
+
+        lane = self.__lane_index(index, Type)
+        if lane is None:
+            return
+
+        self.builder.store(self.builder.insert_element(self.builder.load(ptr), value, lane), ptr)
+
     def __visit_call_expression(self, node: CallExpression) -> tuple[ir.Instruction, ir.Type]:
         name: str = node.function.value
         params: list[Expression] = node.arguments
@@ -308,12 +1016,289 @@ class Compiler:
                 types.append(p_typ)
 
         match name:
+            case 'len' if len(types) != 1 or not (self.__is_array_type(types[0])
+                                                  or isinstance(types[0], ir.VectorType)):
+                self.errors.append(f"len() expects a single array or vector at line {self.line}")
+                return None, None
+            case 'len' if isinstance(types[0], ir.VectorType):
+                ret = ir.Constant(self.type_map['int'], types[0].count)
+                ret_type = self.type_map['int']
+            case 'len':
+                ret = self.builder.extract_value(args[0], 1)
+                ret_type = self.type_map['int']
+            case 'print':
+                ret, ret_type = self.__visit_print(args, types)
+            case _ if name in MATH_BUILTINS:
+                ret, ret_type = self.__visit_math_builtin(name, args, types)
+            case _ if name in VECTOR_TYPES:
+                ret, ret_type = self.__visit_vector_constructor(name, args, types)
+            case _ if name in MAPPED_BUILTINS:
+                ret, ret_type = self.__visit_mmap(name, args, types)
             case _:
+                info = self.function_info.get(name)
+                if (info is None or info.writes_memory) and any(self.__is_mapped(x) for x in params):
+                    self.errors.append(f"Cannot pass a read-only mapped file to {name}, which writes memory")
+
                 func, ret_type = self.env.lookup(name)
-                ret = self.builder.call(func, args)
+                ret = self.__evaluate_call(name, args, ret_type)
+                if ret is None:
+                    ret = self.builder.call(func, self.__expand_arguments(args, types))
 
         return ret, ret_type
 
+    def __evaluate_call(self, name: str, args: list[ir.Value], ret_type: ir.Type) -> ir.Constant | None:
+        if self.evaluator is None or not all(isinstance(arg, ir.Constant) for arg in args):
+            return None
+
+        result = self.evaluator.evaluate(name, [arg.constant for arg in args])
+        if result is None:
+            return None
+
+        return ir.Constant(ret_type, int(result) if isinstance(result, bool) else result)
+
+    def __visit_print(self, args: list[ir.Value], types: list[ir.Type]) -> tuple[ir.Instruction | None, ir.Type]:
+        arg_types = [self.__type_name(typ) for typ in types]
+        if len(arg_types) != 1 or arg_types[0] not in OUTPUT_TAGS:
+            self.errors.append(f"print() expects a single int, float or bool but got ({', '.join(str(t) for t in arg_types)})")
+            return None, ir.VoidType()
+
+        return self.builder.call(self.__print_function(arg_types[0]), args), ir.VoidType()
+
+    def __visit_mmap(self, name: str, args: list[ir.Value],
+                     types: list[ir.Type]) -> tuple[ir.Instruction | None, ir.Type | None]:
+        if len(types) != 1 or types[0] != ir.IntType(8).as_pointer():
+            self.errors.append(f"{name}() expects a single string path")
+            return None, None
+
+        Type = self.type_map[MAPPED_BUILTINS[name]]
+        return self.builder.call(self.__mmap_function(MAPPED_BUILTINS[name][:-2]), args), Type
+
+    def __mmap_function(self, element_type: str) -> ir.Function:
+        name: str = mmap_function_name(element_type)
+        if name in self.module.globals:
+            return self.module.globals[name]
+
+        i32 = ir.IntType(32)
+        i8_ptr = ir.IntType(8).as_pointer()
+        array_type = self.type_map[f"{element_type}[]"]
+
+        open_type = ir.FunctionType(i8_ptr, [i8_ptr, i32, i32.as_pointer()]).as_pointer()
+        if MMAP_OPEN in self.module.globals:
+            open_file = self.module.globals[MMAP_OPEN]
+        else:
+            open_file = ir.GlobalVariable(self.module, open_type, MMAP_OPEN)
+            open_file.initializer = ir.Constant(open_type, None)
+            open_file.linkage = 'linkonce_odr'
+
+        func = ir.Function(self.module, ir.FunctionType(array_type, [i8_ptr]), name=name)
+        func.linkage = 'linkonce_odr'
+        func.attributes.add('nounwind')
+
+        entry = func.append_basic_block('entry')
+        call_block = func.append_basic_block('call')
+        empty_block = func.append_basic_block('empty')
+
+        builder = ir.IRBuilder(entry)
+        length = builder.alloca(i32)
+        callback = builder.load(open_file)
+        builder.cbranch(builder.icmp_unsigned('==', callback, ir.Constant(open_type, None)), empty_block, call_block)
+
+        builder.position_at_end(call_block)
+        data = builder.call(callback, [func.args[0], ir.Constant(i32, MMAP_KINDS[element_type]), length])
+        array = builder.insert_value(ir.Constant(array_type, ir.Undefined),
+                                     builder.bitcast(data, array_type.elements[0]), 0)
+        builder.ret(builder.insert_value(array, builder.load(length), 1))
+
+        builder.position_at_end(empty_block)
+        builder.ret(ir.Constant(array_type, [ir.Constant(array_type.elements[0], None), ir.Constant(i32, 0)]))
+
+        return func
+
+    def __string_constant(self, value: str) -> tuple[ir.Value, ir.Type]:
+        if value not in self.string_constants:
+            data = bytearray(value.encode()) + b"\0"
+            Type = ir.ArrayType(ir.IntType(8), len(data))
+
+            constant = ir.GlobalVariable(self.module, Type, f"__string.{len(self.string_constants)}")
+            constant.initializer = ir.Constant(Type, data)
+            constant.global_constant = True
+            constant.linkage = 'internal'
+            constant.unnamed_addr = True
+            self.string_constants[value] = constant
+
+        ptr = self.string_constants[value].bitcast(ir.IntType(8).as_pointer())
+        return ptr, ptr.type
+
+    def __output_globals(self) -> tuple[ir.GlobalVariable, ir.GlobalVariable, ir.GlobalVariable]:
+        if OUTPUT_BUFFER in self.module.globals:
+            return self.module.globals[OUTPUT_BUFFER], self.module.globals[OUTPUT_LENGTH], self.module.globals[OUTPUT_FLUSH]
+
+        i32 = ir.IntType(32)
+        flush_type = ir.FunctionType(ir.VoidType(), [i32.as_pointer(), i32]).as_pointer()
+
+        buffer = ir.GlobalVariable(self.module, ir.ArrayType(i32, 2 * OUTPUT_RECORDS), OUTPUT_BUFFER)
+        length = ir.GlobalVariable(self.module, i32, OUTPUT_LENGTH)
+        flush = ir.GlobalVariable(self.module, flush_type, OUTPUT_FLUSH)
+
+        for var in (buffer, length, flush):
+            var.initializer = ir.Constant(var.value_type, None)
+            var.linkage = 'linkonce_odr'
+
+        return buffer, length, flush
+
+    def __print_function(self, value_type: str) -> ir.Function:
+        name: str = print_function_name(value_type)
+        if name in self.module.globals:
+            return self.module.globals[name]
+
+        buffer, length, flush = self.__output_globals()
+
+        i32 = ir.IntType(32)
+        func = ir.Function(self.module, ir.FunctionType(ir.VoidType(), [self.type_map[value_type]]), name=name)
+        func.linkage = 'linkonce_odr'
+        func.attributes.add('nounwind')
+
+        entry = func.append_basic_block('entry')
+        flush_block = func.append_basic_block('flush')
+        call_block = func.append_basic_block('call')
+        reset_block = func.append_basic_block('reset')
+        write_block = func.append_basic_block('write')
+
+        builder = ir.IRBuilder(entry)
+        full = builder.icmp_signed('>=', builder.load(length), ir.Constant(i32, OUTPUT_RECORDS))
+        builder.cbranch(full, flush_block, write_block)
+
+        builder.position_at_end(flush_block)
+        callback = builder.load(flush)
+        builder.cbranch(builder.icmp_unsigned('==', callback, ir.Constant(callback.type, None)), reset_block, call_block)
+
+        builder.position_at_end(call_block)
+        data = builder.gep(buffer, [ir.Constant(i32, 0), ir.Constant(i32, 0)], inbounds=True)
+        builder.call(callback, [data, builder.load(length)])
+        builder.branch(reset_block)
+
+        builder.position_at_end(reset_block)
+        builder.store(ir.Constant(i32, 0), length)
+        builder.branch(write_block)
+
+        builder.position_at_end(write_block)
+        count = builder.load(length)
+        index = builder.mul(count, ir.Constant(i32, 2))
+
+        value = func.args[0]
+        match value_type:
+            case 'float':
+                value = builder.bitcast(value, i32)
+            case 'bool':
+                value = builder.zext(value, i32)
+
+        builder.store(ir.Constant(i32, OUTPUT_TAGS[value_type]),
+                      builder.gep(buffer, [ir.Constant(i32, 0), index], inbounds=True))
+        builder.store(value, builder.gep(buffer, [ir.Constant(i32, 0), builder.add(index, ir.Constant(i32, 1))],
+                                         inbounds=True))
+        builder.store(builder.add(count, ir.Constant(i32, 1)), length)
+        builder.ret_void()
+
+        return func
+
+    def __visit_math_builtin(self, name: str, args: list[ir.Value],
+                             types: list[ir.Type]) -> tuple[ir.Instruction | None, ir.Type | None]:
+        arg_types = [self.__type_name(typ) for typ in types]
+
+        return_type, error = builtin_return_type(name, arg_types)
+        if error is not None:
+            self.errors.append(error)
+            return None, None
+
+        intrinsic_name: str = INTRINSICS[(name, tuple(arg_types))]
+        if intrinsic_name == 'llvm.abs.i32':
+            args = args + [ir.Constant(ir.IntType(1), 0)]
+
+        intrinsic = self.__intrinsic(intrinsic_name, self.type_map[return_type], [arg.type for arg in args])
+
+        return self.builder.call(intrinsic, args), self.type_map[return_type]
+
+    def __intrinsic(self, name: str, return_type: ir.Type, arg_types: list[ir.Type]) -> ir.Function:
+        if name in self.module.globals:
+            return self.module.globals[name]
+        return ir.Function(self.module, ir.FunctionType(return_type, arg_types), name=name)
+
+    def __type_name(self, Type: ir.Type) -> str | None:
+        for name, typ in self.type_map.items():
+            if typ == Type:
+                return name
+        return None
+
+    def __expand_arguments(self, args: list[ir.Value], types: list[ir.Type]) -> list[ir.Value]:
+        expanded = []
+        for value, typ in zip(args, types):
+            if self.__is_array_type(typ):
+                expanded.append(self.builder.extract_value(value, 0))
+                expanded.append(self.builder.extract_value(value, 1))
+            else:
+                expanded.append(value)
+        return expanded
+
+    def __index_pointer(self, node: IndexExpression) -> tuple[ir.Value, ir.Type]:
+        array, Type = self.__resolve_value(node.array)
+        index, _ = self.__resolve_value(node.index)
+
+        return self.__element_pointer(array, Type, index)
+
+    def __element_pointer(self, array: ir.Value, Type: ir.Type,
+                          index: ir.Value) -> tuple[ir.Value | None, ir.Type | None]:
+        if not self.__is_array_type(Type):
+            self.errors.append(f"Cannot index a value of type {self.__type_name(Type)} at line {self.line}")
+            return None, None
+
+        if index is None or index.type != self.type_map['int']:
+            self.errors.append(f"Array index must be an int at line {self.line}")
+            return None, None
+
+        data = self.builder.extract_value(array, 0)
+
+        return self.builder.gep(data, [index], inbounds=True), Type.elements[0].pointee
+
+    def __visit_index_expression(self, node: IndexExpression) -> tuple[ir.Value, ir.Type]:
+        array, Type = self.__resolve_value(node.array)
+
+        if isinstance(Type, ir.VectorType):
+            lane = self.__lane_index(node.index, Type)
+            if lane is None:
+                return None, None
+            return self.builder.extract_element(array, lane), Type.element
+
+        index, _ = self.__resolve_value(node.index)
+        ptr, Type = self.__element_pointer(array, Type, index)
+        if ptr is None:
+            return None, None
+        return self.builder.load(ptr), Type
+
+    def __visit_array_literal(self, node: ArrayLiteral) -> tuple[ir.Value, ir.Type]:
+        values = [self.__resolve_value(element) for element in node.elements]
+
+        if len(values) == 0:
+            self.errors.append("Array literal must have at least one element")
+            return None, None
+
+        element_type: ir.Type = values[0][1]
+        if any(typ != element_type for _, typ in values):
+            self.errors.append("Array literal elements must have the same type")
+            return None, None
+
+        storage = self.__entry_alloca(ir.ArrayType(element_type, len(values)))
+        for i, (value, _) in enumerate(values):
+            ptr = self.builder.gep(storage, [ir.Constant(ir.IntType(32), 0), ir.Constant(ir.IntType(32), i)], inbounds=True)
+            self.builder.store(value, ptr)
+
+        Type = self.__array_type(element_type)
+
+        array = ir.Constant(Type, ir.Undefined)
+        array = self.builder.insert_value(array, self.builder.bitcast(storage, element_type.as_pointer()), 0)
+        array = self.builder.insert_value(array, ir.Constant(self.type_map['int'], len(values)), 1)
+
+        return array, Type
+
     def __resolve_value(self, node: Expression) -> tuple[ir.Value, ir.Type]:
         match node.type():
             case NodeType.IntegerLiteral:
@@ -331,8 +1316,16 @@ class Compiler:
             case NodeType.BooleanLiteral:
                 node: BooleanLiteral = node
                 return ir.Constant(ir.IntType(1), 1 if node.value else 0), ir.IntType(1)
+            case NodeType.StringLiteral:
+                node: StringLiteral = node
+                return self.__string_constant(node.value)
+
+            case NodeType.ArrayLiteral:
+                return self.__visit_array_literal(node)
 
             case NodeType.InfixExpression:
                 return self.__visit_infix_expression(node)
             case NodeType.CallExpression:
                 return self.__visit_call_expression(node)
+            case NodeType.IndexExpression:
+                return self.__visit_index_expression(node)
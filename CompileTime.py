@@ -0,0 +1,140 @@
+from Interpreter import InterpretedFunction, FunctionBuilder, DEFAULT_VALUES, INT_MIN, INT_MASK, f32
+from Analysis import FunctionInfo
+
+from AST import FunctionStatement
+
+from typing import Any
+
+import time
+
+
+STEP_BUDGET: int = 50_000
+STEP_CHUNK: int = 1024
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def to_value(value_type: str, value: Any) -> Any:
+    match value_type:
+        case 'int':
+            return ((int(value) - INT_MIN) & INT_MASK) + INT_MIN
+        case 'float':
+            return f32(value)
+        case 'bool':
+            return bool(value)
+    return None
+
+
+class CompileTimeEvaluator:
+    def __init__(self, step_budget: int = STEP_BUDGET, time_budget: float = None) -> None:
+        self.step_budget = step_budget
+        self.time_budget = time_budget
+
+        self.steps: int = 0
+        self.elapsed: float = 0.0
+        self.deadline: float = 0.0
+
+        self.nodes: dict[str, FunctionStatement] = {}
+        self.info: dict[str, FunctionInfo] = {}
+        self.functions: dict[str, InterpretedFunction | None] = {}
+
+        self.evaluated: int = 0
+        self.fallbacks: int = 0
+
+    def define(self, node: FunctionStatement, info: FunctionInfo) -> None:
+        self.info[node.name.value] = info
+
+        if not info.pure() or node.return_type not in DEFAULT_VALUES \
+                or any(p.value_type not in DEFAULT_VALUES for p in node.parameters):
+            return
+
+        self.nodes[node.name.value] = node
+
+    def exhausted(self) -> bool:
+        return self.steps >= self.step_budget or (self.time_budget is not None and self.elapsed >= self.time_budget)
+
+    def evaluate(self, name: str, args: list[Any]) -> Any:
+        if self.exhausted():
+            return None
+
+        function = self.__function(name)
+        if function is None:
+            return None
+
+        args = [to_value(value_type, arg) for value_type, arg in zip(function.param_types, args)]
+
+        st = time.perf_counter()
+        if self.time_budget is not None:
+            self.deadline = st + self.time_budget - self.elapsed
+        try:
+            result = function(*args)
+        except (BudgetExceeded, ArithmeticError, IndexError, RecursionError):
+            self.fallbacks += 1
+            return None
+        finally:
+            self.elapsed += time.perf_counter() - st
+
+        self.evaluated += 1
+        return result
+
+    def __function(self, name: str) -> InterpretedFunction | None:
+        if name in self.functions:
+            return self.functions[name]
+
+        names = self.__reachable(name, set())
+        if names is None:
+            self.functions[name] = None
+            return None
+
+        built = [n for n in names if n not in self.functions]
+        for n in built:
+            node = self.nodes[n]
+            self.functions[n] = InterpretedFunction(n, [p.value_type for p in node.parameters], node.return_type,
+                                                    on_hot=self.__charge, hot_threshold=STEP_CHUNK)
+
+        errors: list[str] = []
+        for n in built:
+            FunctionBuilder(self.functions[n], self.nodes[n], self.functions, errors).build()
+
+        if len(errors) > 0:
+            for n in built:
+                self.functions[n] = None
+
+        return self.functions[name]
+
+    def __reachable(self, name: str, seen: set[str]) -> list[str] | None:
+        if name in seen:
+            return []
+        seen.add(name)
+
+        if name in self.functions:
+            return [] if self.functions[name] is not None else None
+
+        node = self.nodes.get(name)
+        info = self.info.get(name)
+        if node is None or info is None:
+            return None
+
+        names = [name]
+        for callee in sorted(info.calls):
+            reachable = self.__reachable(callee, seen)
+            if reachable is None:
+                return None
+            names.extend(reachable)
+
+        return names
+
+    def __charge(self, function: InterpretedFunction) -> None:
+        self.steps += function.heat
+        function.heat = 0
+
+        if self.steps >= self.step_budget or (self.time_budget is not None and time.perf_counter() >= self.deadline):
+            raise BudgetExceeded(function.name)
+
+    def __str__(self):
+        return f"CompileTimeEvaluator[{self.evaluated} evaluated : {self.fallbacks} fallbacks : {self.steps} steps]"
+
+    def __repr__(self):
+        return str(self)
@@ -0,0 +1,373 @@
+from Target import TargetSpec
+from Linker import CompileError, UnitCache
+from Analysis import FunctionInfo, VECTOR_TYPES
+from Profile import (counters_name, counters_to_profile, save_profile, write_perf_map, is_timing_table,
+                     timing_to_flat_profile, TIMING_PREFIX, TIMING_FIELDS)
+from Report import CompileReport, phase, pass_timing
+from Output import OUTPUT_BUFFER, OUTPUT_LENGTH, OUTPUT_FLUSH, RECORD_SIZE, decode_records
+from Parallel import ParallelRunner, PARALLEL_RUN, PARALLEL_WORKERS
+from MappedFile import MappedFiles, MMAP_OPEN
+
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+import llvmlite.binding as llvm
+from ctypes import CDLL, CFUNCTYPE, POINTER, c_int, c_float, c_bool, c_uint64, c_void_p, addressof, cast, string_at
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CTYPES_MAP: dict[str, type] = {
+    'int': c_int,
+    'float': c_float,
+    'bool': c_bool
+}
+
+ARRAY_DTYPES: dict[str, str] = {
+    'int[]': 'int32',
+    'float[]': 'float32'
+}
+
+BACKENDS: list[str] = ['jit', 'aot']
+
+FLUSH_CALLBACK = CFUNCTYPE(None, c_void_p, c_int)
+
+
+class Engine:
+    def __init__(self, code: str, target: TargetSpec = None, path: str = None, cache: UnitCache = None,
+                 instrument: bool = False, profile: dict = None, debug: bool = False, perf_map: bool = False,
+                 opt_level: int = 0, backend: str = 'jit', report: CompileReport = None,
+                 output: BinaryIO = None, timing: bool = False, workers: int = PARALLEL_WORKERS,
+                 stream: bool = False) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+
+        if cache is None:
+            cache = UnitCache(target=target, instrument=instrument, profile=profile, debug=debug, timing=timing,
+                              stream=stream)
+
+        self.cache: UnitCache = cache
+        self.target: TargetSpec = self.cache.target
+        self.target_machine = self.cache.target_machine
+
+        self.unit = self.cache.compile_source(code, path=path, report=report)
+
+        self.signatures: dict[str, tuple[list[str], str]] = self.cache.signatures(self.unit)
+        self.function_info: dict[str, FunctionInfo] = self.cache.function_info(self.unit)
+        self.profile_counters: dict[str, int] = self.cache.profile_counters(self.unit)
+
+        self.backend = backend
+        self.execution_engine: llvm.ExecutionEngine | None = None
+        self.library: CDLL | None = None
+
+        self.objects: list[bytes] = []
+
+        self.stdout: BinaryIO = output if output is not None else io.BytesIO()
+        self.flush_callback = None
+
+        self.workers = workers
+        self.parallel_runner: ParallelRunner | None = None
+
+        self.files = MappedFiles(os.path.dirname(path) if path is not None else None)
+
+        with phase(report, "link"):
+            self.llvm_module = self.cache.link(self.unit)
+
+        if report is not None:
+            report.record_functions(self.llvm_module, 'before')
+
+        with pass_timing(report):
+            with phase(report, "optimize"):
+                pass_manager = self.cache.pass_manager(opt_level)
+                if pass_manager is not None:
+                    pass_manager.run(self.llvm_module)
+
+            if report is not None:
+                report.record_functions(self.llvm_module, 'after')
+
+            with phase(report, "finalize"):
+                self.__finalize(backend, perf_map)
+
+        self.functions: dict[str, Callable] = {}
+
+        self.__bind_output()
+        self.__bind_parallel()
+        self.__bind_files()
+
+    def __finalize(self, backend: str, perf_map: bool) -> None:
+        if backend == 'aot':
+            self.__load_shared_library()
+            return
+
+        self.execution_engine = llvm.create_mcjit_compiler(self.llvm_module, self.target.create_target_machine())
+
+        if perf_map:
+            self.execution_engine.set_object_cache(notify_func=lambda module, data: self.objects.append(data))
+
+        self.execution_engine.finalize_object()
+
+        if perf_map:
+            write_perf_map(self.symbols())
+
+    def __bind_output(self) -> None:
+        try:
+            self.llvm_module.get_global_variable(OUTPUT_FLUSH)
+        except NameError:
+            return
+
+        self.flush_callback = FLUSH_CALLBACK(self.__write_records)
+        c_void_p.from_address(self.global_address(OUTPUT_FLUSH)).value = cast(self.flush_callback, c_void_p).value
+
+    def __bind_parallel(self) -> None:
+        try:
+            self.llvm_module.get_global_variable(PARALLEL_RUN)
+        except NameError:
+            return
+
+        if self.workers <= 1:
+            return
+
+        self.parallel_runner = ParallelRunner(self.workers)
+        c_void_p.from_address(self.global_address(PARALLEL_RUN)).value = \
+            cast(self.parallel_runner.callback, c_void_p).value
+
+    def __bind_files(self) -> None:
+        try:
+            self.llvm_module.get_global_variable(MMAP_OPEN)
+        except NameError:
+            return
+
+        c_void_p.from_address(self.global_address(MMAP_OPEN)).value = cast(self.files.callback, c_void_p).value
+
+    def unmap_files(self) -> None:
+        self.files.release()
+        self.files.check()
+
+    def __write_records(self, data: int, count: int) -> None:
+        self.stdout.write(decode_records(string_at(data, count * RECORD_SIZE)))
+
+    def flush_output(self) -> None:
+        if self.flush_callback is None:
+            return
+
+        length = c_int.from_address(self.global_address(OUTPUT_LENGTH))
+        if length.value > 0:
+            self.__write_records(self.global_address(OUTPUT_BUFFER), length.value)
+            length.value = 0
+
+        self.stdout.flush()
+
+    def output(self) -> bytes:
+        self.flush_output()
+
+        if isinstance(self.stdout, io.BytesIO):
+            return self.stdout.getvalue()
+        return b""
+
+    def __load_shared_library(self) -> None:
+        linker = shutil.which("cc")
+        if linker is None:
+            raise RuntimeError("The aot backend needs a C compiler driver (cc) to link shared libraries")
+
+        target_machine = self.target.create_target_machine(jit=False)
+
+        with tempfile.TemporaryDirectory() as build_dir:
+            object_path = os.path.join(build_dir, "program.o")
+            library_path = os.path.join(build_dir, "program.so")
+
+            with open(object_path, "wb") as object_file:
+                object_file.write(target_machine.emit_object(self.llvm_module))
+
+            subprocess.run([linker, "-shared", "-Wl,-Bsymbolic", "-o", library_path, object_path], check=True,
+                           capture_output=True)
+
+            self.library = CDLL(library_path)
+
+    def function_address(self, name: str) -> int:
+        if self.library is not None:
+            return cast(self.library[name], c_void_p).value
+        return self.execution_engine.get_function_address(name)
+
+    def global_address(self, name: str) -> int:
+        if self.library is not None:
+            return addressof(c_uint64.in_dll(self.library, name))
+        return self.execution_engine.get_global_value_address(name)
+
+    def function(self, name: str) -> Callable:
+        if name in self.functions:
+            return self.functions[name]
+
+        if name not in self.signatures:
+            raise NameError(f"Function {name} is not defined")
+
+        param_types, return_type = self.signatures[name]
+
+        vector_types = [t for t in param_types + [return_type] if t in VECTOR_TYPES]
+        if len(vector_types) > 0:
+            raise TypeError(f"{name}() uses vector type {vector_types[0]}, which cannot be called from Python")
+
+        arg_types = []
+        for value_type in param_types:
+            if value_type in ARRAY_DTYPES:
+                arg_types.extend([POINTER(CTYPES_MAP[value_type[:-2]]), c_int])
+            else:
+                arg_types.append(CTYPES_MAP[value_type])
+
+        entry = self.function_address(name)
+        cfunc = CFUNCTYPE(CTYPES_MAP[return_type], *arg_types)(entry)
+
+        self.functions[name] = cfunc
+        return cfunc
+
+    def call(self, name: str, *args: Any) -> Any:
+        cfunc = self.function(name)
+        try:
+            result = cfunc(*self.__arguments(name, args))
+        finally:
+            self.unmap_files()
+        self.flush_output()
+        return result
+
+    def symbols(self) -> list[tuple[int, int, str]]:
+        addresses = []
+        for function in self.llvm_module.functions:
+            if function.is_declaration:
+                continue
+            try:
+                address = self.function_address(function.name)
+            except AttributeError:
+                continue
+            if address:
+                addresses.append((address, function.name))
+        addresses.sort()
+
+        text_size = 0
+        for data in self.objects:
+            for section in llvm.ObjectFileRef.from_data(data).sections():
+                if section.is_text():
+                    text_size += section.size()
+        text_end = addresses[0][0] + text_size if len(addresses) > 0 else 0
+
+        symbols = []
+        for i, (address, name) in enumerate(addresses):
+            end = addresses[i + 1][0] if i + 1 < len(addresses) else max(text_end, address)
+            symbols.append((address, end - address, name))
+
+        return symbols
+
+    def profile(self) -> dict:
+        counters = {}
+        for name, size in self.profile_counters.items():
+            address = self.global_address(counters_name(name))
+            counters[name] = list((c_uint64 * size).from_address(address))
+
+        return counters_to_profile(counters)
+
+    def save_profile(self, path: str) -> None:
+        save_profile(self.profile(), path)
+
+    def timing_tables(self) -> dict[str, list[int]]:
+        tables = {}
+        for variable in self.llvm_module.global_variables:
+            if is_timing_table(variable.name) and not variable.is_declaration:
+                address = self.global_address(variable.name)
+                tables[variable.name[len(TIMING_PREFIX):]] = list((c_uint64 * len(TIMING_FIELDS)).from_address(address))
+
+        return tables
+
+    def flat_profile(self) -> list[dict]:
+        return timing_to_flat_profile(self.timing_tables())
+
+    def reset_timing(self) -> None:
+        for name in self.timing_tables():
+            address = self.global_address(f"{TIMING_PREFIX}{name}")
+            (c_uint64 * len(TIMING_FIELDS)).from_address(address)[:] = [0] * len(TIMING_FIELDS)
+
+    def parallel_map(self, name: str, inputs: Iterable, workers: int = None) -> list:
+        cfunc = self.function(name)
+        if self.function_info[name].writes_output:
+            raise TypeError(f"{name}() writes output and cannot be mapped in parallel")
+
+        calls = [self.__arguments(name, args if isinstance(args, tuple) else (args,)) for args in inputs]
+        if len(calls) == 0:
+            return []
+
+        workers = workers if workers else os.cpu_count()
+        chunk_size = -(-len(calls) // workers)
+
+        def run_chunk(start: int) -> list:
+            return [cfunc(*c_args) for c_args in calls[start:start + chunk_size]]
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunks = executor.map(run_chunk, range(0, len(calls), chunk_size))
+                results = [result for chunk in chunks for result in chunk]
+        finally:
+            self.unmap_files()
+        self.flush_output()
+        return results
+
+    def close(self) -> None:
+        self.functions.clear()
+        self.files.release()
+        self.library = None
+
+        if self.parallel_runner is not None:
+            self.parallel_runner.close()
+            self.parallel_runner = None
+
+        if self.execution_engine is not None:
+            self.execution_engine.close()
+            self.execution_engine = None
+
+    def __arguments(self, name: str, args: tuple) -> list:
+        param_types, _ = self.signatures[name]
+
+        if len(args) != len(param_types):
+            raise TypeError(f"{name}() takes {len(param_types)} arguments but {len(args)} were given")
+
+        c_args = []
+        for value, value_type in zip(args, param_types):
+            if value_type in ARRAY_DTYPES:
+                c_args.extend(self.__array_arguments(value, value_type))
+            else:
+                c_args.append(value)
+
+        return c_args
+
+    def __array_arguments(self, value: Any, value_type: str) -> tuple[Any, int]:
+        if np is None:
+            raise TypeError(f"numpy is required to pass {value_type} arguments")
+
+        dtype = np.dtype(ARRAY_DTYPES[value_type])
+
+        if not isinstance(value, np.ndarray) or value.dtype != dtype or value.ndim != 1 \
+                or not value.flags.c_contiguous:
+            raise TypeError(f"Expected a contiguous one-dimensional {dtype} array for {value_type} argument")
+
+        return value.ctypes.data_as(POINTER(CTYPES_MAP[value_type[:-2]])), len(value)
+
+
+def compile_many(sources: Iterable[str | tuple[str, str]], target: TargetSpec = None, opt_level: int = 0,
+                 backend: str = 'jit', use_disk: bool = False) -> Iterator[tuple[str | None, Engine]]:
+    cache = UnitCache(target=target, use_disk=use_disk)
+
+    for source in sources:
+        code, path = (source, None) if isinstance(source, str) else source
+
+        engine = Engine(code=code, path=path, cache=cache, opt_level=opt_level, backend=backend)
+        cache.release(engine.unit)
+
+        try:
+            yield path, engine
+        finally:
+            engine.close()
@@ -0,0 +1,7 @@
+class CompileError(Exception):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+    def __reduce__(self):
+        return CompileError, (self.errors,)
@@ -0,0 +1,835 @@
+from Parser import parse_program
+from Errors import CompileError
+from Runtime import RUNTIME_PATH, is_runtime
+from Analysis import BUILTINS, MATH_BUILTINS, VECTOR_TYPES, builtin_return_type, parallel_errors
+from Analysis import MAPPED_BUILTINS, vector_constructor_error, vector_result_type
+from MappedFile import MappedFiles, MMAP_KINDS
+from Output import OUTPUT_RECORDS, OUTPUT_TAGS, format_value
+
+from AST import Node, NodeType, Program, Expression
+from AST import FunctionStatement, BlockStatement, IfStatement, WhileStatement, ParallelStatement, ImportStatement
+from AST import InfixExpression, CallExpression, ArrayLiteral
+
+from typing import Any, BinaryIO, Callable
+from ctypes import c_float
+
+import io
+import math
+import os
+import threading
+
+
+INTERPRETER_BACKEND: str = 'interp'
+
+HOT_THRESHOLD: int = 10_000
+WARM_INTERVAL: int = 1024
+
+DEFAULT_VALUES: dict[str, Any] = {
+    'int': 0,
+    'float': 0.0,
+    'bool': False
+}
+
+INT_MIN: int = -2 ** 31
+INT_MASK: int = 2 ** 32 - 1
+
+Frame = list
+Evaluator = Callable[[Frame], Any]
+Executor = Callable[[Frame], bool]
+
+
+def f32(value: float) -> float:
+    return c_float(value).value
+
+
+def sdiv(left: int, right: int) -> int:
+    quotient = abs(left) // abs(right)
+    quotient = quotient if (left < 0) == (right < 0) else -quotient
+    return ((quotient - INT_MIN) & INT_MASK) + INT_MIN
+
+
+def fdiv(left: float, right: float) -> float:
+    if right == 0.0:
+        return math.nan if left == 0.0 or math.isnan(left) else math.copysign(math.inf, left) * math.copysign(1.0, right)
+    return f32(left / right)
+
+
+def fsqrt(value: float) -> float:
+    return f32(math.sqrt(value)) if value >= 0.0 else math.nan
+
+
+def iabs(value: int) -> int:
+    return ((abs(value) - INT_MIN) & INT_MASK) + INT_MIN
+
+
+def fminnum(left: float, right: float) -> float:
+    return right if math.isnan(left) else left if math.isnan(right) else min(left, right)
+
+
+def fmaxnum(left: float, right: float) -> float:
+    return right if math.isnan(left) else left if math.isnan(right) else max(left, right)
+
+
+def fpow(base: float, exponent: float) -> float:
+    try:
+        return f32(math.pow(base, exponent))
+    except ValueError:
+        return math.nan
+    except OverflowError:
+        return math.inf
+
+
+def ffloor(value: float) -> float:
+    return float(math.floor(value)) if math.isfinite(value) else value
+
+
+def fexp(value: float) -> float:
+    try:
+        return f32(math.exp(value))
+    except OverflowError:
+        return math.inf
+
+
+MATH_FUNCTIONS: dict[tuple[str, tuple[str, ...]], Callable] = {
+    ('sqrt', ('float',)): fsqrt,
+    ('abs', ('int',)): iabs,
+    ('abs', ('float',)): abs,
+    ('min', ('int', 'int')): min,
+    ('min', ('float', 'float')): fminnum,
+    ('max', ('int', 'int')): max,
+    ('max', ('float', 'float')): fmaxnum,
+    ('pow', ('float', 'float')): fpow,
+    ('pow', ('float', 'int')): fpow,
+    ('fma', ('float', 'float', 'float')): lambda x, y, z: f32(x * y + z),
+    ('floor', ('float',)): ffloor,
+    ('exp', ('float',)): fexp
+}
+
+VECTOR_OPERATIONS: dict[tuple[str, str], Callable] = {
+    ('int', '+'): lambda x, y: ((x + y - INT_MIN) & INT_MASK) + INT_MIN,
+    ('int', '-'): lambda x, y: ((x - y - INT_MIN) & INT_MASK) + INT_MIN,
+    ('int', '*'): lambda x, y: ((x * y - INT_MIN) & INT_MASK) + INT_MIN,
+    ('int', '/'): sdiv,
+    ('float', '+'): lambda x, y: f32(x + y),
+    ('float', '-'): lambda x, y: f32(x - y),
+    ('float', '*'): lambda x, y: f32(x * y),
+    ('float', '/'): fdiv
+}
+
+
+class InterpretedFunction:
+    def __init__(self, name: str, param_types: list[str], return_type: str, on_hot: Callable = None,
+                 hot_threshold: int = HOT_THRESHOLD) -> None:
+        self.name = name
+        self.param_types = param_types
+        self.return_type = return_type
+
+        self.frame: Frame = [DEFAULT_VALUES.get(return_type)]
+        self.body: Executor | None = None
+
+        self.writes_output: bool = False
+
+        self.heat: int = 0
+        self.hot_threshold = hot_threshold
+        self.on_hot = on_hot
+
+        self.invoke: Callable = self.__interpret
+
+    def native_compatible(self) -> bool:
+        return not self.writes_output and self.return_type in DEFAULT_VALUES \
+            and all(t in DEFAULT_VALUES for t in self.param_types)
+
+    def warm(self, iterations: int = 1) -> None:
+        self.heat += iterations
+        if self.heat >= self.hot_threshold and self.on_hot is not None:
+            self.on_hot(self)
+
+    def __interpret(self, *args: Any) -> Any:
+        self.heat += 1
+        if self.heat == self.hot_threshold and self.on_hot is not None:
+            self.on_hot(self)
+
+        frame = self.frame.copy()
+        frame[1:1 + len(args)] = args
+        self.body(frame)
+        return frame[0]
+
+    def __call__(self, *args: Any) -> Any:
+        return self.invoke(*args)
+
+    def __str__(self):
+        return f"InterpretedFunction[{self.name} : {'native' if self.invoke != self.__interpret else 'interpreted'}]"
+
+    def __repr__(self):
+        return str(self)
+
+
+class FunctionBuilder:
+    def __init__(self, function: InterpretedFunction, node: FunctionStatement,
+                 functions: dict[str, InterpretedFunction], errors: list[str],
+                 runtime: Callable[[str], InterpretedFunction | None] = None,
+                 write: Callable[[str], None] = None, files: MappedFiles = None) -> None:
+        self.function = function
+        self.node = node
+        self.functions = functions
+        self.errors = errors
+        self.runtime = runtime
+        self.write = write
+        self.files = files
+
+        self.slots: dict[str, tuple[int, str]] = {}
+        self.mapped: set[str] = set()
+        self.line: int = node.line
+        for param in node.parameters:
+            self.__define(param.name, param.value_type)
+
+    def build(self) -> None:
+        self.function.body = self.__block(self.node.body)
+        self.function.frame.extend(None for _ in self.slots)
+
+    def __define(self, name: str, value_type: str) -> int:
+        if name not in self.slots:
+            self.slots[name] = (len(self.slots) + 1, value_type)
+        return self.slots[name][0]
+
+    def __statement(self, node: Node) -> Executor | None:
+        if node.line > 0:
+            self.line = node.line
+
+        match node.type():
+            case NodeType.ExpressionStatement:
+                if node.expr.type() == NodeType.IfStatement:
+                    return self.__if(node.expr)
+
+                evaluate, _ = self.__expression(node.expr)
+
+                def run(frame: Frame) -> bool:
+                    evaluate(frame)
+                    return False
+
+                return run
+
+            case NodeType.VarStatement:
+                evaluate, value_type = self.__expression(node.value)
+                slot = self.__define(node.name.value, value_type)
+                self.__track_mapped(node.name.value, node.value)
+
+                def run(frame: Frame) -> bool:
+                    frame[slot] = evaluate(frame)
+                    return False
+
+                return run
+
+            case NodeType.AssignStatement:
+                return self.__assign(node)
+
+            case NodeType.ReturnStatement:
+                evaluate, _ = self.__expression(node.return_value)
+
+                def run(frame: Frame) -> bool:
+                    frame[0] = evaluate(frame)
+                    return True
+
+                return run
+
+            case NodeType.BlockStatement:
+                return self.__block(node)
+
+            case NodeType.IfStatement:
+                return self.__if(node)
+
+            case NodeType.WhileStatement:
+                return self.__while(node)
+
+            case NodeType.ParallelStatement:
+                return self.__parallel(node)
+
+        self.errors.append(f"Statement {node.type()} is not supported inside functions")
+        return None
+
+    def __block(self, node: BlockStatement) -> Executor:
+        statements = [self.__statement(stmt) for stmt in node.statements]
+        statements = [stmt for stmt in statements if stmt is not None]
+
+        if len(statements) == 1:
+            return statements[0]
+
+        def run(frame: Frame) -> bool:
+            for stmt in statements:
+                if stmt(frame):
+                    return True
+            return False
+
+        return run
+
+    def __assign(self, node) -> Executor:
+        evaluate, _ = self.__expression(node.right_value)
+
+        if node.ident.type() == NodeType.IndexExpression:
+            array, array_type = self.__expression(node.ident.array)
+            index, index_type = self.__expression(node.ident.index)
+            self.__check_index(array_type, index_type)
+
+            if node.ident.array.type() == NodeType.IdentifierLiteral and node.ident.array.value in self.mapped:
+                self.errors.append(f"Array {node.ident.array.value} is a read-only mapped file")
+
+            if array_type in VECTOR_TYPES and node.ident.array.type() == NodeType.IdentifierLiteral:
+                self.__check_lane(node.ident.index, array_type)
+                vector_slot, _ = self.slots[node.ident.array.value]
+
+                def run(frame: Frame) -> bool:
+                    value = evaluate(frame)
+                    lanes = list(frame[vector_slot])
+                    lanes[index(frame)] = value
+                    frame[vector_slot] = tuple(lanes)
+                    return False
+
+                return run
+
+            def run(frame: Frame) -> bool:
+                value = evaluate(frame)
+                array(frame)[index(frame)] = value
+                return False
+
+            return run
+
+        name: str = node.ident.value
+        if name not in self.slots:
+            self.errors.append(f"Identifier {name} has not been declared before re-assignment")
+        slot = self.__define(name, None)
+        self.__track_mapped(name, node.right_value)
+
+        def run(frame: Frame) -> bool:
+            frame[slot] = evaluate(frame)
+            return False
+
+        return run
+
+    def __track_mapped(self, name: str, value: Expression) -> None:
+        match value.type():
+            case NodeType.CallExpression if value.function.value in MAPPED_BUILTINS:
+                self.mapped.add(name)
+            case NodeType.IdentifierLiteral if value.value in self.mapped:
+                self.mapped.add(name)
+            case _:
+                self.mapped.discard(name)
+
+    def __if(self, node: IfStatement) -> Executor:
+        test, _ = self.__expression(node.condition)
+        consequence = self.__block(node.consequence)
+        alternative = self.__block(node.alternative) if node.alternative is not None else None
+
+        if alternative is None:
+            def run(frame: Frame) -> bool:
+                if test(frame):
+                    return consequence(frame)
+                return False
+        else:
+            def run(frame: Frame) -> bool:
+                if test(frame):
+                    return consequence(frame)
+                return alternative(frame)
+
+        return run
+
+    def __while(self, node: WhileStatement) -> Executor:
+        test, _ = self.__expression(node.condition)
+        body = self.__block(node.body)
+        function = self.function
+
+        def run(frame: Frame) -> bool:
+            iterations = 0
+            try:
+                while test(frame):
+                    iterations += 1
+                    if iterations == WARM_INTERVAL:
+                        function.warm(iterations)
+                        iterations = 0
+                    if body(frame):
+                        return True
+                return False
+            finally:
+                function.warm(iterations)
+
+        return run
+
+    def __parallel(self, node: ParallelStatement) -> Executor | None:
+        errors = parallel_errors(node, {})
+
+        reduction_slot, reduction_type = None, None
+        if node.reduction is not None:
+            if node.reduction not in self.slots:
+                errors.append(f"Reduction variable {node.reduction} has not been declared")
+            else:
+                reduction_slot, reduction_type = self.slots[node.reduction]
+                if reduction_type not in ('int', 'float'):
+                    errors.append(f"Reduction variable {node.reduction} must be an int or a float")
+
+        if len(errors) > 0:
+            self.errors.extend(errors)
+            return None
+
+        start, _ = self.__expression(node.start)
+        end, _ = self.__expression(node.end)
+        slot = self.__define(node.variable, 'int')
+        body = self.__block(node.body)
+        function = self.function
+
+        if reduction_type == 'float':
+            combine = lambda total, partial: f32(total + partial)
+        else:
+            combine = lambda total, partial: ((total + partial - INT_MIN) & INT_MASK) + INT_MIN
+
+        def run(frame: Frame) -> bool:
+            lo, hi = start(frame), end(frame)
+
+            total = None
+            if reduction_slot is not None:
+                total = frame[reduction_slot]
+                frame[reduction_slot] = DEFAULT_VALUES[reduction_type]
+
+            iterations = 0
+            for i in range(lo, hi):
+                iterations += 1
+                if iterations == WARM_INTERVAL:
+                    function.warm(iterations)
+                    iterations = 0
+                frame[slot] = i
+                body(frame)
+            function.warm(iterations)
+
+            if reduction_slot is not None:
+                frame[reduction_slot] = combine(total, frame[reduction_slot])
+            return False
+
+        return run
+
+    def __expression(self, node: Expression) -> tuple[Evaluator, str | None]:
+        match node.type():
+            case NodeType.IntegerLiteral:
+                value = ((node.value - INT_MIN) & INT_MASK) + INT_MIN
+                return (lambda frame: value), 'int'
+
+            case NodeType.FloatLiteral:
+                value = f32(node.value)
+                return (lambda frame: value), 'float'
+
+            case NodeType.BooleanLiteral:
+                value = bool(node.value)
+                return (lambda frame: value), 'bool'
+
+            case NodeType.StringLiteral:
+                value = node.value
+                return (lambda frame: value), 'str'
+
+            case NodeType.IdentifierLiteral:
+                if node.value not in self.slots:
+                    self.errors.append(f"Identifier {node.value} is not defined")
+                    return (lambda frame: None), None
+
+                slot, value_type = self.slots[node.value]
+                return (lambda frame: frame[slot]), value_type
+
+            case NodeType.ArrayLiteral:
+                return self.__array_literal(node)
+
+            case NodeType.InfixExpression:
+                return self.__infix(node)
+
+            case NodeType.CallExpression:
+                return self.__call(node)
+
+            case NodeType.IndexExpression:
+                array, array_type = self.__expression(node.array)
+                index, index_type = self.__expression(node.index)
+                self.__check_index(array_type, index_type)
+                if array_type in VECTOR_TYPES:
+                    self.__check_lane(node.index, array_type)
+                    return (lambda frame: array(frame)[index(frame)]), VECTOR_TYPES[array_type][0]
+                return (lambda frame: array(frame)[index(frame)]), array_type[:-2] if array_type else None
+
+        self.errors.append(f"Expression {node.type()} is not supported")
+        return (lambda frame: None), None
+
+    def __check_index(self, array_type: str | None, index_type: str | None) -> None:
+        if array_type is not None and not array_type.endswith('[]') and array_type not in VECTOR_TYPES:
+            self.errors.append(f"Cannot index a value of type {array_type} at line {self.line}")
+        elif index_type is not None and index_type != 'int':
+            self.errors.append(f"Array index must be an int at line {self.line}")
+
+    def __array_literal(self, node: ArrayLiteral) -> tuple[Evaluator, str | None]:
+        elements = [self.__expression(element) for element in node.elements]
+
+        if len(elements) == 0:
+            self.errors.append("Array literal must have at least one element")
+            return (lambda frame: None), None
+
+        element_type = elements[0][1]
+        if any(typ != element_type for _, typ in elements):
+            self.errors.append("Array literal elements must have the same type")
+
+        evaluators = [evaluate for evaluate, _ in elements]
+        return (lambda frame: [evaluate(frame) for evaluate in evaluators]), f"{element_type}[]"
+
+    def __infix(self, node: InfixExpression) -> tuple[Evaluator, str | None]:
+        left, left_type = self.__expression(node.left_node)
+        right, right_type = self.__expression(node.right_node)
+
+        if left_type in VECTOR_TYPES or right_type in VECTOR_TYPES:
+            return self.__vector_infix(node.operator, left, left_type, right, right_type)
+
+        match node.operator:
+            case '<':
+                return (lambda frame: left(frame) < right(frame)), 'bool'
+            case '<=':
+                return (lambda frame: left(frame) <= right(frame)), 'bool'
+            case '>':
+                return (lambda frame: left(frame) > right(frame)), 'bool'
+            case '>=':
+                return (lambda frame: left(frame) >= right(frame)), 'bool'
+            case '==':
+                return (lambda frame: left(frame) == right(frame)), 'bool'
+            case '!=':
+                return (lambda frame: left(frame) != right(frame)), 'bool'
+
+        if left_type == 'float' and right_type == 'float':
+            match node.operator:
+                case '+':
+                    return (lambda frame: f32(left(frame) + right(frame))), 'float'
+                case '-':
+                    return (lambda frame: f32(left(frame) - right(frame))), 'float'
+                case '*':
+                    return (lambda frame: f32(left(frame) * right(frame))), 'float'
+                case '/':
+                    return (lambda frame: fdiv(left(frame), right(frame))), 'float'
+
+        elif left_type in ('int', 'bool') and right_type in ('int', 'bool'):
+            match node.operator:
+                case '+':
+                    return (lambda frame: ((left(frame) + right(frame) - INT_MIN) & INT_MASK) + INT_MIN), 'int'
+                case '-':
+                    return (lambda frame: ((left(frame) - right(frame) - INT_MIN) & INT_MASK) + INT_MIN), 'int'
+                case '*':
+                    return (lambda frame: ((left(frame) * right(frame) - INT_MIN) & INT_MASK) + INT_MIN), 'int'
+                case '/':
+                    return (lambda frame: sdiv(left(frame), right(frame))), 'int'
+
+        self.errors.append(f"Unsupported operation {left_type} {node.operator} {right_type}")
+        return (lambda frame: None), None
+
+    def __vector_infix(self, operator: str, left: Evaluator, left_type: str | None, right: Evaluator,
+                       right_type: str | None) -> tuple[Evaluator, str | None]:
+        vector_type = vector_result_type(left_type, right_type)
+        operation = VECTOR_OPERATIONS.get((VECTOR_TYPES[vector_type][0], operator)) if vector_type else None
+        if operation is None:
+            self.errors.append(f"Unsupported operation {left_type} {operator} {right_type}")
+            return (lambda frame: None), None
+
+        lanes = VECTOR_TYPES[vector_type][1]
+        if left_type != vector_type:
+            left = self.__splat(left, lanes)
+        if right_type != vector_type:
+            right = self.__splat(right, lanes)
+
+        return (lambda frame: tuple(map(operation, left(frame), right(frame)))), vector_type
+
+    def __check_lane(self, index: Expression, vector_type: str) -> None:
+        if index.type() == NodeType.IntegerLiteral and not 0 <= index.value < VECTOR_TYPES[vector_type][1]:
+            self.errors.append(f"Lane {index.value} is out of range for {vector_type}")
+
+    @staticmethod
+    def __splat(evaluate: Evaluator, lanes: int) -> Evaluator:
+        return lambda frame: (evaluate(frame),) * lanes
+
+    def __call(self, node: CallExpression) -> tuple[Evaluator, str | None]:
+        name: str = node.function.value
+        compiled = [self.__expression(arg) for arg in node.arguments]
+        args = [evaluate for evaluate, _ in compiled]
+
+        if name == 'len':
+            if len(compiled) != 1 or (compiled[0][1] is not None and not compiled[0][1].endswith('[]')
+                                      and compiled[0][1] not in VECTOR_TYPES):
+                self.errors.append(f"len() expects a single array or vector at line {self.line}")
+                return (lambda frame: None), None
+
+            array = args[0]
+            return (lambda frame: len(array(frame))), 'int'
+
+        if name == 'print':
+            return self.__print(args, [typ for _, typ in compiled])
+
+        if name in MATH_BUILTINS:
+            return self.__math_builtin(name, args, [typ for _, typ in compiled])
+
+        if name in MAPPED_BUILTINS:
+            return self.__mmap(name, args, [typ for _, typ in compiled])
+
+        if name in VECTOR_TYPES:
+            error = vector_constructor_error(name, [typ for _, typ in compiled])
+            if error is not None:
+                self.errors.append(error)
+                return (lambda frame: None), None
+
+            if len(args) == 1:
+                return self.__splat(args[0], VECTOR_TYPES[name][1]), name
+            return (lambda frame: tuple(arg(frame) for arg in args)), name
+
+        function = self.functions.get(name)
+        if function is None and self.runtime is not None:
+            function = self.runtime(name)
+        if function is None:
+            self.errors.append(f"Function {name} is not defined")
+            return (lambda frame: None), None
+
+        if function.writes_output:
+            self.function.writes_output = True
+
+        if len(args) != len(function.param_types):
+            self.errors.append(f"{name}() takes {len(function.param_types)} arguments but {len(args)} were given")
+
+        match len(args):
+            case 0:
+                return (lambda frame: function.invoke()), function.return_type
+            case 1:
+                a0, = args
+                return (lambda frame: function.invoke(a0(frame))), function.return_type
+            case 2:
+                a0, a1 = args
+                return (lambda frame: function.invoke(a0(frame), a1(frame))), function.return_type
+            case 3:
+                a0, a1, a2 = args
+                return (lambda frame: function.invoke(a0(frame), a1(frame), a2(frame))), function.return_type
+
+        return (lambda frame: function.invoke(*[arg(frame) for arg in args])), function.return_type
+
+
+    def __mmap(self, name: str, args: list[Evaluator], arg_types: list[str]) -> tuple[Evaluator, str | None]:
+        if arg_types != ['str']:
+            self.errors.append(f"{name}() expects a single string path")
+            return (lambda frame: None), None
+
+        if self.files is None:
+            self.errors.append(f"{name}() is not available here")
+            return (lambda frame: None), None
+
+        path, = args
+        files = self.files
+        kind = MMAP_KINDS[MAPPED_BUILTINS[name][:-2]]
+
+        return (lambda frame: files.view(path(frame), kind)), MAPPED_BUILTINS[name]
+
+    def __print(self, args: list[Evaluator], arg_types: list[str]) -> tuple[Evaluator, str | None]:
+        if len(arg_types) != 1 or arg_types[0] not in OUTPUT_TAGS:
+            self.errors.append(f"print() expects a single int, float or bool but got ({', '.join(str(t) for t in arg_types)})")
+            return (lambda frame: None), None
+
+        self.function.writes_output = True
+
+        value, = args
+        value_type: str = arg_types[0]
+        write = self.write
+
+        return (lambda frame: write(format_value(value_type, value(frame)))), None
+
+    def __math_builtin(self, name: str, args: list[Evaluator], arg_types: list[str]) -> tuple[Evaluator, str | None]:
+        return_type, error = builtin_return_type(name, arg_types)
+        if error is not None:
+            self.errors.append(error)
+            return (lambda frame: None), None
+
+        function = MATH_FUNCTIONS[(name, tuple(arg_types))]
+
+        match len(args):
+            case 1:
+                a0, = args
+                return (lambda frame: function(a0(frame))), return_type
+            case 2:
+                a0, a1 = args
+                return (lambda frame: function(a0(frame), a1(frame))), return_type
+
+        return (lambda frame: function(*[arg(frame) for arg in args])), return_type
+
+
+class Interpreter:
+    def __init__(self, code: str, path: str = None, tier_up: bool = True, hot_threshold: int = HOT_THRESHOLD,
+                 opt_level: int = 2, output: BinaryIO = None) -> None:
+        self.code = code
+        self.path = path
+
+        self.stdout: BinaryIO = output if output is not None else io.BytesIO()
+        self.lines: list[str] = []
+
+        self.tier_up = tier_up
+        self.hot_threshold = hot_threshold
+        self.opt_level = opt_level
+
+        self.errors: list[str] = []
+
+        self.modules: dict[str, dict[str, InterpretedFunction]] = {}
+        self.loading: list[str | None] = []
+        self.files = MappedFiles(os.path.dirname(path) if path is not None else None)
+
+        program = parse_program(code)
+        self.functions: dict[str, InterpretedFunction] = self.__load(program, path)
+
+        if len(self.errors) > 0:
+            raise CompileError(self.errors)
+
+        self.lock = threading.Lock()
+        self.hot: list[InterpretedFunction] = []
+        self.engine = None
+        self.tier_up_error: Exception | None = None
+        self.compile_thread: threading.Thread | None = None
+
+    def __load(self, program: Program, path: str | None) -> dict[str, InterpretedFunction]:
+        self.loading.append(os.path.abspath(path) if path is not None else None)
+        try:
+            return self.__load_program(program, path)
+        finally:
+            self.loading.pop()
+
+    def __load_program(self, program: Program, path: str | None) -> dict[str, InterpretedFunction]:
+        base_dir = os.path.dirname(path) if path is not None else os.getcwd()
+
+        visible: dict[str, InterpretedFunction] = {}
+        own: dict[str, InterpretedFunction] = {}
+
+        on_hot = self.__on_hot if self.tier_up and not is_runtime(path) else None
+
+        for stmt in program.statements:
+            match stmt.type():
+                case NodeType.ImportStatement:
+                    visible.update(self.__import(stmt, base_dir))
+
+                case NodeType.FunctionStatement:
+                    name: str = stmt.name.value
+                    if name in BUILTINS:
+                        self.errors.append(f"Function {name} shadows a builtin")
+                        continue
+
+                    function = InterpretedFunction(name, [p.value_type for p in stmt.parameters], stmt.return_type,
+                                                   on_hot=on_hot,
+                                                   hot_threshold=self.hot_threshold)
+                    visible[name] = function
+                    own[name] = function
+
+                    FunctionBuilder(function, stmt, visible, self.errors,
+                                    None if is_runtime(path) else self.__runtime_function, self.__write,
+                                    self.files).build()
+
+                case _:
+                    self.errors.append(f"Statement {stmt.type()} is not supported at the top level")
+
+        return own
+
+    def __import(self, node: ImportStatement, base_dir: str) -> dict[str, InterpretedFunction]:
+        path = os.path.abspath(os.path.join(base_dir, node.path))
+        if path in self.loading:
+            cycle = self.loading[self.loading.index(path):] + [path]
+            self.errors.append(f"Import cycle {' -> '.join(os.path.basename(p) for p in cycle)}")
+            return {}
+
+        functions = self.__load_file(path)
+        if functions is None:
+            self.errors.append(f"Unresolved import {node.path}")
+            return {}
+
+        return functions
+
+    def __runtime_function(self, name: str) -> InterpretedFunction | None:
+        functions = self.__load_file(RUNTIME_PATH)
+        return functions.get(name) if functions is not None else None
+
+    def __load_file(self, path: str) -> dict[str, InterpretedFunction] | None:
+        if path not in self.modules:
+            try:
+                with open(path, "r") as file:
+                    code = file.read()
+            except OSError:
+                return None
+
+            self.modules[path] = {}
+            self.modules[path] = self.__load(parse_program(code), path)
+
+        return self.modules[path]
+
+    def function(self, name: str) -> InterpretedFunction:
+        if name not in self.functions:
+            raise NameError(f"Function {name} is not defined")
+        return self.functions[name]
+
+    def call(self, name: str, *args: Any) -> Any:
+        function = self.function(name)
+
+        if len(args) != len(function.param_types):
+            raise TypeError(f"{name}() takes {len(function.param_types)} arguments but {len(args)} were given")
+
+        try:
+            result = function(*args)
+        finally:
+            self.unmap_files()
+        self.flush_output()
+        return result
+
+    def unmap_files(self) -> None:
+        self.files.release()
+        if self.engine is not None:
+            self.engine.unmap_files()
+
+    def __write(self, line: str) -> None:
+        self.lines.append(line)
+        if len(self.lines) >= OUTPUT_RECORDS:
+            self.flush_output()
+
+    def flush_output(self) -> None:
+        if len(self.lines) > 0:
+            self.stdout.write(("\n".join(self.lines) + "\n").encode())
+            self.lines.clear()
+
+        self.stdout.flush()
+
+    def output(self) -> bytes:
+        self.flush_output()
+
+        if isinstance(self.stdout, io.BytesIO):
+            return self.stdout.getvalue()
+        return b""
+
+    def wait(self, timeout: float = None) -> bool:
+        thread = self.compile_thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.engine is not None
+
+    def __on_hot(self, function: InterpretedFunction) -> None:
+        with self.lock:
+            if function in self.hot or not function.native_compatible():
+                return
+
+            self.hot.append(function)
+
+            if self.engine is not None:
+                self.__promote(function)
+            elif self.compile_thread is None:
+                self.compile_thread = threading.Thread(target=self.__compile, daemon=True)
+                self.compile_thread.start()
+
+    def __compile(self) -> None:
+        from Engine import Engine
+
+        try:
+            engine = Engine(code=self.code, path=self.path, opt_level=self.opt_level)
+        except Exception as e:
+            self.tier_up_error = e
+            return
+
+        with self.lock:
+            self.engine = engine
+            for function in self.hot:
+                self.__promote(function)
+
+    def __promote(self, function: InterpretedFunction) -> None:
+        try:
+            function.invoke = self.engine.function(function.name)
+        except Exception as e:
+            self.tier_up_error = e
@@ -10,6 +10,8 @@ class Lexer:
         self.pos: int = -1
         self.read_pos: int = 0
         self.line: int = 1
+        self.line_start: int = 0
+        self.token_start: int = 0
 
         self.current_ch: None = None
 
@@ -33,11 +35,12 @@ class Lexer:
         while self.current_ch in [' ', '\t', '\n', '\r']:
             if self.current_ch == '\n':
                 self.line += 1
+                self.line_start = self.read_pos
 
             self.__read_ch()
 
     def __new_token(self, tt: TokenType, literal: Any) -> Token:
-        return Token(type=tt, literal=literal, line=self.line, pos=self.pos)
+        return Token(type=tt, literal=literal, line=self.line, pos=self.pos, column=self.token_start - self.line_start + 1)
 
     def __is_digit(self, ch: str) -> bool:
         return '0' <= ch <= '9'
@@ -77,11 +80,29 @@ class Lexer:
 
         return self.code[pos:self.pos]
 
+    def __read_string(self) -> Token:
+        start_pos = self.pos + 1
+        self.__read_ch()
+
+        while self.current_ch is not None and self.current_ch != '"':
+            if self.current_ch == '\n':
+                self.line += 1
+                self.line_start = self.read_pos
+            self.__read_ch()
+
+        if self.current_ch is None:
+            print(f"Unterminated string Line: {self.line} Pos: {self.pos}")
+            return self.__new_token(TokenType.ILLEGAL, self.code[start_pos:self.pos])
+
+        return self.__new_token(TokenType.STRING, self.code[start_pos:self.pos])
+
     def next_token(self) -> Token:
         tok: Token = None
 
         self.__skip_whitespace()
 
+        self.token_start = self.pos
+
         match self.current_ch:
             case '+':
                 if self.__peek_ch() == '+':
@@ -111,12 +132,18 @@ class Lexer:
                 tok = self.__new_token(TokenType.LBRACE, self.current_ch)
             case '}':
                 tok = self.__new_token(TokenType.RBRACE, self.current_ch)
+            case '[':
+                tok = self.__new_token(TokenType.LBRACKET, self.current_ch)
+            case ']':
+                tok = self.__new_token(TokenType.RBRACKET, self.current_ch)
             case ':':
                 tok = self.__new_token(TokenType.COLON, self.current_ch)
             case ';':
                 tok = self.__new_token(TokenType.SEMICOLON, self.current_ch)
             case '@':
                 tok = self.__new_token(TokenType.AT, self.current_ch)
+            case '"':
+                tok = self.__read_string()
             case None:
                 tok = self.__new_token(TokenType.EOF, "")
             case '<':
@@ -0,0 +1,307 @@
+from Parser import parse_program, stream_program, scan_imports
+from CodeGen import Compiler
+from Target import TargetSpec, create_pass_manager
+from Analysis import FunctionInfo
+from AST import Program, Statement, NodeType
+from Errors import CompileError
+from Report import CompileReport, phase
+from Runtime import RUNTIME_PATH, is_runtime, runtime_digest
+
+from typing import Callable, Iterable
+
+import hashlib
+import json
+import os
+
+import llvmlite.binding as llvm
+
+
+CACHE_DIR: str = "__llcache__"
+CACHE_VERSION: int = 9
+
+
+def compile_program(program: Program | Iterable[Statement], target: TargetSpec = None, imports: dict = None,
+                    instrument: bool = False, profile: dict = None, debug: bool = False, filename: str = "<source>",
+                    runtime: Callable = None, timing: bool = False, stream: bool = False) -> Compiler:
+    cpu_name, cpu_features = (target.cpu_name(), target.feature_string()) if target is not None else (None, None)
+
+    compiler = Compiler(cpu_name=cpu_name, cpu_features=cpu_features, imports=imports, instrument=instrument,
+                        profile=profile, debug=debug, filename=filename, runtime=runtime, timing=timing,
+                        stream=stream)
+    for node in (program if stream else [program]):
+        compiler.compile(node=node)
+
+    if len(compiler.errors) > 0:
+        raise CompileError(compiler.errors)
+
+    compiler.module.triple = llvm.get_default_triple()
+
+    return compiler
+
+
+class CompilationUnit:
+    def __init__(self, path: str | None, key: str, signatures: dict[str, tuple[list[str], str]],
+                 function_info: dict[str, FunctionInfo], dependencies: list['CompilationUnit'],
+                 profile_counters: dict[str, int] = None, module: llvm.ModuleRef = None, bitcode: bytes = None) -> None:
+        self.path = path
+        self.key = key
+        self.signatures = signatures
+        self.function_info = function_info
+        self.dependencies = dependencies
+        self.profile_counters = profile_counters if profile_counters else {}
+
+        self.module: llvm.ModuleRef | None = module
+        self.__bitcode: bytes | None = bitcode
+
+    @property
+    def bitcode(self) -> bytes:
+        if self.__bitcode is None:
+            self.__bitcode = self.module.as_bitcode()
+        return self.__bitcode
+
+    def llvm_module(self) -> llvm.ModuleRef:
+        if self.module is None:
+            self.module = llvm.parse_bitcode(self.__bitcode)
+        return self.module
+
+    def json(self) -> dict:
+        return {
+            "path": self.path,
+            "key": self.key,
+            "signatures": {name: [params, ret] for name, (params, ret) in self.signatures.items()},
+            "function_info": {name: info.json() for name, info in self.function_info.items()},
+            "profile_counters": self.profile_counters,
+            "runtime": any(is_runtime(dependency.path) for dependency in self.dependencies)
+        }
+
+    def __str__(self):
+        return f"CompilationUnit[{self.path} : {self.key[:16]}]"
+
+    def __repr__(self):
+        return str(self)
+
+
+class UnitCache:
+    def __init__(self, target: TargetSpec = None, use_disk: bool = True, instrument: bool = False,
+                 profile: dict = None, debug: bool = False, timing: bool = False, stream: bool = False) -> None:
+        self.target: TargetSpec = target if target is not None else TargetSpec()
+        self.target_machine: llvm.TargetMachine = self.target.create_target_machine()
+        self.data_layout: str = str(self.target_machine.target_data)
+
+        self.use_disk = use_disk
+
+        self.instrument = instrument
+        self.profile = profile
+        self.debug = debug
+        self.timing = timing
+        self.stream = stream
+
+        self.units: dict[str, CompilationUnit] = {}
+        self.runtime: CompilationUnit | None = None
+        self.importing: list[str | None] = []
+        self.pass_managers: dict[int, llvm.ModulePassManager | None] = {}
+
+    def compile_file(self, path: str, report: CompileReport = None) -> CompilationUnit:
+        path = os.path.abspath(path)
+        with open(path, "r") as file:
+            code = file.read()
+
+        return self.compile_source(code, path=path, report=report)
+
+    def compile_source(self, code: str, path: str = None, report: CompileReport = None) -> CompilationUnit:
+        self.importing.append(os.path.abspath(path) if path is not None else None)
+        try:
+            return self.__compile_source(code, path, report)
+        finally:
+            self.importing.pop()
+
+    def __compile_source(self, code: str, path: str | None, report: CompileReport | None) -> CompilationUnit:
+        if self.stream:
+            with phase(report, "scan"):
+                import_paths = scan_imports(code)
+        else:
+            with phase(report, "parse"):
+                program = parse_program(code)
+            import_paths = [stmt.path for stmt in program.statements if stmt.type() == NodeType.ImportStatement]
+        imports = self.compile_import_paths(import_paths, path, report)
+
+        key = self.__unit_key(code, imports)
+        if key in self.units:
+            return self.units[key]
+
+        dependencies = list(imports.values())
+
+        with phase(report, "cache_load"):
+            unit = self.__load(path, key, dependencies)
+
+        if unit is None:
+            with phase(report, "codegen"):
+                compiler = compile_program(stream_program(code) if self.stream else program, target=self.target,
+                                           imports=imports, instrument=self.instrument,
+                                           profile=self.profile, debug=self.debug,
+                                           filename=path if path is not None else "<source>",
+                                           runtime=None if is_runtime(path) else self.runtime_unit,
+                                           timing=self.timing, stream=self.stream)
+                compiler.module.data_layout = self.data_layout
+
+            if compiler.runtime_unit is not None:
+                dependencies.append(compiler.runtime_unit)
+
+            with phase(report, "parse_ir"):
+                llvm_module = llvm.parse_assembly(str(compiler.module))
+            with phase(report, "verify"):
+                llvm_module.verify()
+
+            if is_runtime(path):
+                for function in llvm_module.functions:
+                    if not function.is_declaration:
+                        function.linkage = 'linkonce_odr'
+
+            unit = CompilationUnit(path, key, compiler.signatures, compiler.function_info, dependencies,
+                                   compiler.profile_counters, module=llvm_module)
+            with phase(report, "cache_store"):
+                self.__store(unit)
+
+        self.units[key] = unit
+        return unit
+
+    def compile_imports(self, program: Program, path: str = None,
+                        report: CompileReport = None) -> dict[str, CompilationUnit]:
+        import_paths = [stmt.path for stmt in program.statements if stmt.type() == NodeType.ImportStatement]
+        return self.compile_import_paths(import_paths, path, report)
+
+    def compile_import_paths(self, import_paths: list[str], path: str = None,
+                             report: CompileReport = None) -> dict[str, CompilationUnit]:
+        base_dir = os.path.dirname(path) if path is not None else os.getcwd()
+
+        imports: dict[str, CompilationUnit] = {}
+        for import_path in import_paths:
+            if import_path in imports:
+                continue
+
+            file_path = os.path.abspath(os.path.join(base_dir, import_path))
+            if file_path in self.importing:
+                cycle = self.importing[self.importing.index(file_path):] + [file_path]
+                raise CompileError([f"Import cycle {' -> '.join(os.path.basename(p) for p in cycle)}"])
+            if not os.path.isfile(file_path):
+                raise CompileError([f"Unresolved import {import_path}"])
+
+            imports[import_path] = self.compile_file(file_path, report)
+
+        return imports
+
+    def runtime_unit(self) -> CompilationUnit:
+        if self.runtime is None:
+            self.runtime = self.compile_file(RUNTIME_PATH)
+        return self.runtime
+
+    def release(self, unit: CompilationUnit) -> None:
+        self.units.pop(unit.key, None)
+
+    def pass_manager(self, opt_level: int) -> llvm.ModulePassManager | None:
+        if opt_level not in self.pass_managers:
+            self.pass_managers[opt_level] = create_pass_manager(self.target_machine, opt_level)
+        return self.pass_managers[opt_level]
+
+    def link(self, unit: CompilationUnit) -> llvm.ModuleRef:
+        module = unit.llvm_module().clone()
+        for dependency in self.dependencies(unit):
+            module.link_in(dependency.llvm_module(), preserve=True)
+
+        return module
+
+    def dependencies(self, unit: CompilationUnit) -> list[CompilationUnit]:
+        order: list[CompilationUnit] = []
+        seen: set[str] = {unit.key}
+
+        def visit(current: CompilationUnit) -> None:
+            for dependency in current.dependencies:
+                if dependency.key not in seen:
+                    seen.add(dependency.key)
+                    visit(dependency)
+                    order.append(dependency)
+
+        visit(unit)
+        return order
+
+    def signatures(self, unit: CompilationUnit) -> dict[str, tuple[list[str], str]]:
+        return self.__merged(unit, 'signatures', include_runtime=False)
+
+    def function_info(self, unit: CompilationUnit) -> dict[str, FunctionInfo]:
+        return self.__merged(unit, 'function_info', include_runtime=False)
+
+    def profile_counters(self, unit: CompilationUnit) -> dict[str, int]:
+        return self.__merged(unit, 'profile_counters')
+
+    def __merged(self, unit: CompilationUnit, attribute: str, include_runtime: bool = True) -> dict:
+        merged = {}
+        for dependency in self.dependencies(unit):
+            if include_runtime or not is_runtime(dependency.path):
+                merged.update(getattr(dependency, attribute))
+        merged.update(getattr(unit, attribute))
+
+        return merged
+
+    def __unit_key(self, code: str, imports: dict[str, CompilationUnit]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}:{llvm.get_default_triple()}:{self.data_layout}".encode())
+        digest.update(f"{self.target.cpu_name()}:{self.target.feature_string()}".encode())
+        digest.update(f"{self.instrument}:{json.dumps(self.profile, sort_keys=True)}:{self.debug}".encode())
+        digest.update(f"timing:{self.timing}".encode())
+        digest.update(f"runtime:{runtime_digest()}".encode())
+        for import_path in sorted(imports):
+            digest.update(f"{import_path}:{imports[import_path].key}".encode())
+        digest.update(code.encode())
+
+        return digest.hexdigest()
+
+    def __cache_paths(self, path: str, key: str) -> tuple[str, str]:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR)
+        stem = os.path.join(cache_dir, f"{os.path.basename(path)}.{key[:16]}")
+
+        return f"{stem}.bc", f"{stem}.json"
+
+    def __load(self, path: str | None, key: str, dependencies: list[CompilationUnit]) -> CompilationUnit | None:
+        if path is None or not self.use_disk:
+            return None
+
+        bitcode_path, meta_path = self.__cache_paths(path, key)
+
+        try:
+            with open(meta_path, "r") as meta_file:
+                meta = json.load(meta_file)
+            with open(bitcode_path, "rb") as bitcode_file:
+                bitcode = bitcode_file.read()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("key") != key:
+            return None
+
+        signatures = {name: (params, ret) for name, (params, ret) in meta["signatures"].items()}
+        function_info = {name: FunctionInfo.from_json(info) for name, info in meta["function_info"].items()}
+
+        if meta.get("runtime"):
+            dependencies = dependencies + [self.runtime_unit()]
+
+        return CompilationUnit(path, key, signatures, function_info, dependencies, meta["profile_counters"],
+                               bitcode=bitcode)
+
+    def __store(self, unit: CompilationUnit) -> None:
+        if unit.path is None or not self.use_disk:
+            return
+
+        bitcode_path, meta_path = self.__cache_paths(unit.path, unit.key)
+
+        try:
+            os.makedirs(os.path.dirname(bitcode_path), exist_ok=True)
+            self.__write_atomic(bitcode_path, unit.bitcode)
+            self.__write_atomic(meta_path, json.dumps(unit.json(), indent=4).encode())
+        except OSError:
+            pass
+
+    def __write_atomic(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
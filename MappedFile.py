@@ -0,0 +1,149 @@
+from ctypes import CDLL, CFUNCTYPE, POINTER, c_char_p, c_int, c_long, c_size_t, c_void_p, get_errno
+
+import mmap
+import os
+import threading
+
+
+MMAP_OPEN: str = "__mmap.open"
+
+MMAP_KINDS: dict[str, int] = {
+    'int': 0,
+    'float': 1
+}
+
+MMAP_FORMATS: dict[int, str] = {
+    0: 'i',
+    1: 'f'
+}
+
+RECORD_BYTES: int = 4
+MAX_RECORDS: int = 2 ** 31 - 1
+
+MMAP_CALLBACK = CFUNCTYPE(c_void_p, c_char_p, c_int, POINTER(c_int))
+
+MAP_FAILED: int = 2 ** 64 - 1
+
+
+def mmap_function_name(element_type: str) -> str:
+    return f"__mmap.{element_type}"
+
+
+def record_count(size: int) -> int:
+    return min(size // RECORD_BYTES, MAX_RECORDS)
+
+
+def load_libc() -> CDLL | None:
+    if os.name != 'posix':
+        return None
+
+    libc = CDLL(None, use_errno=True)
+    libc.mmap.restype = c_void_p
+    libc.mmap.argtypes = [c_void_p, c_size_t, c_int, c_int, c_int, c_long]
+    libc.munmap.restype = c_int
+    libc.munmap.argtypes = [c_void_p, c_size_t]
+    return libc
+
+
+class MappedFiles:
+    def __init__(self, base_dir: str = None) -> None:
+        self.base_dir = base_dir if base_dir is not None else os.getcwd()
+
+        self.native: dict[tuple[str, int], tuple[int, int]] = {}
+        self.views: dict[tuple[str, int], tuple[mmap.mmap, memoryview, memoryview]] = {}
+        self.errors: list[str] = []
+
+        self.libc: CDLL | None = None
+        self.lock = threading.Lock()
+
+        self.callback = MMAP_CALLBACK(self.__open)
+
+    def resolve(self, path: str) -> str:
+        return os.path.abspath(os.path.join(self.base_dir, path))
+
+    def __open(self, path: bytes, kind: int, length) -> int | None:
+        try:
+            address, size = self.map(path.decode(), kind)
+        except (OSError, UnicodeDecodeError) as e:
+            with self.lock:
+                self.errors.append(f"Cannot map {path.decode(errors='replace')}: {e}")
+            length[0] = 0
+            return None
+
+        length[0] = record_count(size)
+        return address
+
+    def map(self, path: str, kind: int) -> tuple[int | None, int]:
+        if kind not in MMAP_FORMATS:
+            raise OSError(f"Unknown record kind {kind}")
+
+        key = (self.resolve(path), kind)
+        with self.lock:
+            if key in self.native:
+                return self.native[key]
+
+            if self.libc is None:
+                self.libc = load_libc()
+                if self.libc is None:
+                    raise OSError("Memory-mapped files need a POSIX libc")
+
+            fd = os.open(key[0], os.O_RDONLY)
+            try:
+                size = os.fstat(fd).st_size
+                address = None
+                if size > 0:
+                    address = self.libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_PRIVATE, fd, 0)
+                    if address is None or address == MAP_FAILED:
+                        raise OSError(get_errno(), os.strerror(get_errno()))
+            finally:
+                os.close(fd)
+
+            self.native[key] = (address, size)
+            return address, size
+
+    def view(self, path: str, kind: int) -> memoryview:
+        key = (self.resolve(path), kind)
+
+        with self.lock:
+            if key in self.views:
+                return self.views[key][2]
+
+            with open(key[0], "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:
+                    return memoryview(b"").cast(MMAP_FORMATS[kind])
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            raw = memoryview(mapping)
+            records = raw[:record_count(size) * RECORD_BYTES].cast(MMAP_FORMATS[kind])
+            self.views[key] = (mapping, raw, records)
+            return records
+
+    def check(self) -> None:
+        with self.lock:
+            errors, self.errors = self.errors, []
+
+        if len(errors) > 0:
+            raise OSError("\n".join(errors))
+
+    def release(self) -> None:
+        with self.lock:
+            for address, size in self.native.values():
+                if address is not None:
+                    self.libc.munmap(address, size)
+            self.native.clear()
+
+            for mapping, raw, records in self.views.values():
+                records.release()
+                raw.release()
+                mapping.close()
+            self.views.clear()
+
+    def __len__(self) -> int:
+        return len(self.native) + len(self.views)
+
+    def __str__(self):
+        return f"MappedFiles[{len(self)} mapped : {self.base_dir}]"
+
+    def __repr__(self):
+        return str(self)
@@ -1,4 +1,5 @@
 import re
+import sys
 
 
 def find_called_functions(llvm_ir):
@@ -62,13 +63,21 @@ def optimize_variable_assignments(llvm_ir):
     return "\n".join(optimized_lines)
 
 
-with open('code.ll', 'r') as file:
-    llvm_ir = file.read()
+def optimize(llvm_ir):
+    llvm_ir = optimize_unused_functions(llvm_ir)
+    llvm_ir = optimize_variable_assignments(llvm_ir)
 
-llvm_ir = optimize_unused_functions(llvm_ir)
-llvm_ir = optimize_variable_assignments(llvm_ir)
+    return llvm_ir
 
-with open('optimized_code.ll', 'w') as file:
-    file.write(llvm_ir)
 
-print("created optimized_code.ll")
+if __name__ == "__main__":
+    input_path = sys.argv[1] if len(sys.argv) > 1 else 'code.ll'
+    output_path = sys.argv[2] if len(sys.argv) > 2 else 'optimized_code.ll'
+
+    with open(input_path, 'r') as file:
+        llvm_ir = file.read()
+
+    with open(output_path, 'w') as file:
+        file.write(optimize(llvm_ir))
+
+    print(f"created {output_path}")
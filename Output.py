@@ -0,0 +1,68 @@
+from ctypes import c_float
+
+import array
+import struct
+
+
+OUTPUT_RECORDS: int = 8192
+RECORD_SIZE: int = 8
+
+OUTPUT_BUFFER: str = "__output.buffer"
+OUTPUT_LENGTH: str = "__output.length"
+OUTPUT_FLUSH: str = "__output.flush"
+
+OUTPUT_TAGS: dict[str, int] = {
+    'int': 0,
+    'float': 1,
+    'bool': 2
+}
+
+RECORD_STRUCT: struct.Struct = struct.Struct("=ii")
+FLOAT_BITS: struct.Struct = struct.Struct("=f")
+INT_BITS: struct.Struct = struct.Struct("=i")
+
+
+def print_function_name(value_type: str) -> str:
+    return f"__print.{value_type}"
+
+
+def format_float(value: float) -> str:
+    for precision in range(6, 9):
+        text = f"{value:.{precision}g}"
+        if c_float(float(text)).value == value:
+            return text
+    return f"{value:.9g}"
+
+
+def format_value(value_type: str, value) -> str:
+    match value_type:
+        case 'float':
+            return format_float(value)
+        case 'bool':
+            return 'true' if value else 'false'
+    return str(value)
+
+
+def decode_records(data: bytes) -> bytes:
+    if len(data) == 0:
+        return b""
+
+    words = array.array('i', data)
+
+    tags = words[0::2]
+    if tags.count(OUTPUT_TAGS['int']) == len(tags):
+        return ("\n".join(map(str, words[1::2])) + "\n").encode()
+
+    lines = []
+    for tag, bits in RECORD_STRUCT.iter_unpack(data):
+        match tag:
+            case 0:
+                lines.append(str(bits))
+            case 1:
+                lines.append(format_float(FLOAT_BITS.unpack(INT_BITS.pack(bits))[0]))
+            case 2:
+                lines.append('true' if bits else 'false')
+
+    if len(lines) == 0:
+        return b""
+    return ("\n".join(lines) + "\n").encode()
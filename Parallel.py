@@ -0,0 +1,85 @@
+from ctypes import CFUNCTYPE, c_int, c_void_p
+from concurrent.futures import ThreadPoolExecutor
+
+import os
+import threading
+
+
+PARALLEL_RUN: str = "__parallel.run"
+PARALLEL_PREFIX: str = "__parallel."
+
+PARALLEL_CHUNKS: int = 64
+PARTIAL_SIZE: int = 8
+
+PARALLEL_WORKERS: int = os.cpu_count() or 1
+
+PARALLEL_CALLBACK = CFUNCTYPE(c_int, c_void_p, c_void_p, c_int, c_int, c_void_p)
+PARALLEL_BODY = CFUNCTYPE(None, c_void_p, c_int, c_int, c_void_p)
+
+
+def parallel_function_name(function: str, index: int) -> str:
+    return f"{PARALLEL_PREFIX}{function}.{index}"
+
+
+def split_range(start: int, end: int, chunks: int) -> list[tuple[int, int]]:
+    count = end - start
+    if count <= 0:
+        return []
+
+    chunks = max(1, min(chunks, count))
+    size, extra = divmod(count, chunks)
+
+    ranges = []
+    for k in range(chunks):
+        stop = start + size + (1 if k < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+
+    return ranges
+
+
+class ParallelRunner:
+    def __init__(self, workers: int = PARALLEL_WORKERS) -> None:
+        self.workers = max(1, min(workers, PARALLEL_CHUNKS))
+        self.executor: ThreadPoolExecutor | None = None
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+        self.callback = PARALLEL_CALLBACK(self.__run)
+
+    def __run(self, body: int, context: int, start: int, end: int, partials: int) -> int:
+        function = PARALLEL_BODY(body)
+
+        ranges = split_range(start, end, self.workers)
+        if len(ranges) <= 1 or getattr(self.local, 'worker', False):
+            function(context, start, end, partials)
+            return 1
+
+        executor = self.__executor()
+        futures = [executor.submit(self.__chunk, function, context, lo, hi, partials + k * PARTIAL_SIZE)
+                   for k, (lo, hi) in enumerate(ranges)]
+        for future in futures:
+            future.result()
+
+        return len(ranges)
+
+    def __chunk(self, function: PARALLEL_BODY, context: int, start: int, end: int, partial: int) -> None:
+        self.local.worker = True
+        function(context, start, end, partial)
+
+    def __executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parallel")
+            return self.executor
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __str__(self):
+        return f"ParallelRunner[{self.workers} workers]"
+
+    def __repr__(self):
+        return str(self)
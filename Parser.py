@@ -1,15 +1,17 @@
 from Lexer import Lexer
 from Tokens import TokenType, Token
-from typing import Callable
+from typing import Callable, Iterator
 from enum import Enum, auto
 
 from AST import Program, Statement, Expression
 from AST import (ExpressionStatement, VarStatement, FunctionStatement, BlockStatement, ReturnStatement, AssignStatement,
-                 IfStatement, WhileStatement)
-from AST import InfixExpression, CallExpression
-from AST import IntegerLiteral, FloatLiteral, IdentifierLiteral, BooleanLiteral
+                 IfStatement, WhileStatement, ParallelStatement, ImportStatement)
+from AST import InfixExpression, CallExpression, IndexExpression
+from AST import IntegerLiteral, FloatLiteral, IdentifierLiteral, BooleanLiteral, StringLiteral, ArrayLiteral
 from AST import FunctionParameter
 
+from Errors import CompileError
+
 
 class PrecedenceType(Enum):
     P_LOWEST = 0
@@ -18,6 +20,7 @@ class PrecedenceType(Enum):
     P_SUM = auto()
     P_PRODUCT = auto()
     P_CALL = auto()
+    P_INDEX = auto()
 
 
 PRECEDENCES: dict[TokenType, PrecedenceType] = {
@@ -31,7 +34,8 @@ PRECEDENCES: dict[TokenType, PrecedenceType] = {
     TokenType.GT: PrecedenceType.P_LESSGREATER,
     TokenType.LT_EQ: PrecedenceType.P_LESSGREATER,
     TokenType.GT_EQ: PrecedenceType.P_LESSGREATER,
-    TokenType.LPAREN: PrecedenceType.P_CALL
+    TokenType.LPAREN: PrecedenceType.P_CALL,
+    TokenType.LBRACKET: PrecedenceType.P_INDEX
 }
 
 
@@ -46,12 +50,15 @@ class Parser:
 
         self.prefix_parse_fns: dict[TokenType, Callable] = {
             TokenType.IDENT: self.__parse_identifier,
+            TokenType.TYPE: self.__parse_identifier,
             TokenType.INT: self.__parse_int_literal,
             TokenType.FLOAT: self.__parse_float_literal,
             TokenType.LPAREN: self.__parse_grouped_expression,
             TokenType.IF: self.__parse_if_statement,
             TokenType.TRUE: self.__parse_boolean,
-            TokenType.FALSE: self.__parse_boolean
+            TokenType.FALSE: self.__parse_boolean,
+            TokenType.STRING: self.__parse_string_literal,
+            TokenType.LBRACKET: self.__parse_array_literal
         }
         self.infix_parse_fns: dict[TokenType, Callable] = {
             TokenType.SUM: self.__parse_infix_expression,
@@ -64,7 +71,8 @@ class Parser:
             TokenType.GT: self.__parse_infix_expression,
             TokenType.LT_EQ: self.__parse_infix_expression,
             TokenType.GT_EQ: self.__parse_infix_expression,
-            TokenType.LPAREN: self.__parse_call_expression
+            TokenType.LPAREN: self.__parse_call_expression,
+            TokenType.LBRACKET: self.__parse_index_expression
         }
 
         self.__next_token()
@@ -106,19 +114,32 @@ class Parser:
     def __no_prefix_parse_fn_error(self, tt: TokenType):
         self.errors.append(f"No prefix parse function for {tt}")
 
-    def parse_program(self) -> None:
+    def parse_program(self) -> Program:
         program: Program = Program()
 
+        for stmt in self.statements():
+            program.statements.append(stmt)
+
+        return program
+
+    def statements(self) -> Iterator[Statement]:
         while self.current_token.type != TokenType.EOF:
             stmt: Statement = self.__parse_statement()
             if stmt is not None:
-                program.statements.append(stmt)
+                yield stmt
 
             self.__next_token()
 
-        return program
-
     def __parse_statement(self) -> Statement:
+        token: Token = self.current_token
+
+        stmt: Statement = self.__parse_statement_node()
+        if stmt is not None:
+            stmt.line, stmt.column = token.line, token.column
+
+        return stmt
+
+    def __parse_statement_node(self) -> Statement:
         if self.current_token.type == TokenType.IDENT and self.__peek_token_is(TokenType.EQ):
             return self.__parse_assignment_statement()
 
@@ -131,12 +152,32 @@ class Parser:
                 return self.__parse_return_statement()
             case TokenType.WHILE:
                 return self.__parse_while_statement()
+            case TokenType.PARALLEL:
+                return self.__parse_parallel_statement()
+            case TokenType.IMPORT:
+                return self.__parse_import_statement()
             case _:
                 return self.__parse_expression_statement()
 
+    def __parse_type(self) -> str:
+        value_type: str = self.current_token.literal
+
+        if self.__peek_token_is(TokenType.LBRACKET):
+            self.__next_token()
+
+            if not self.__expect_peek(TokenType.RBRACKET):
+                return None
+
+            value_type += "[]"
+
+        return value_type
+
     def __parse_expression_statement(self) -> ExpressionStatement:
         expr = self.__parse_expression(PrecedenceType.P_LOWEST)
 
+        if isinstance(expr, IndexExpression) and self.__peek_token_is(TokenType.EQ):
+            return self.__parse_index_assignment_statement(expr)
+
         if self.__peek_token_is(TokenType.SEMICOLON):
             self.__next_token()
 
@@ -159,7 +200,7 @@ class Parser:
         if not self.__expect_peek(TokenType.TYPE):
             return None
 
-        stmt.value_type = self.current_token.literal
+        stmt.value_type = self.__parse_type()
 
         if not self.__expect_peek(TokenType.EQ):
             return None
@@ -192,7 +233,7 @@ class Parser:
         if not self.__expect_peek(TokenType.TYPE):
             return None
 
-        stmt.return_type = self.current_token.literal
+        stmt.return_type = self.__parse_type()
 
         if not self.__expect_peek(TokenType.LBRACE):
             return None
@@ -217,7 +258,7 @@ class Parser:
 
         self.__next_token()
 
-        first_param.value_type = self.current_token.literal
+        first_param.value_type = self.__parse_type()
         params.append(first_param)
 
         while self.__peek_token_is(TokenType.COMMA):
@@ -231,7 +272,7 @@ class Parser:
 
             self.__next_token()
 
-            param.value_type = self.current_token.literal
+            param.value_type = self.__parse_type()
             params.append(param)
 
         if not self.__expect_peek(TokenType.RPAREN):
@@ -280,6 +321,18 @@ class Parser:
 
         return stmt
 
+    def __parse_index_assignment_statement(self, target: IndexExpression) -> AssignStatement:
+        stmt: AssignStatement = AssignStatement(ident=target)
+
+        self.__next_token()
+        self.__next_token()
+
+        stmt.right_value = self.__parse_expression(PrecedenceType.P_LOWEST)
+
+        self.__next_token()
+
+        return stmt
+
     def __parse_if_statement(self) -> IfStatement:
         condition: Expression = None
         consequence: BlockStatement = None
@@ -319,6 +372,50 @@ class Parser:
 
         return WhileStatement(condition=condition, body=body)
 
+    def __parse_parallel_statement(self) -> ParallelStatement:
+        if not self.__expect_peek(TokenType.IDENT):
+            return None
+
+        stmt: ParallelStatement = ParallelStatement(variable=self.current_token.literal)
+
+        if not self.__expect_peek(TokenType.COLON):
+            return None
+
+        self.__next_token()
+        stmt.start = self.__parse_expression(PrecedenceType.P_LOWEST)
+
+        if not self.__expect_peek(TokenType.COMMA):
+            return None
+
+        self.__next_token()
+        stmt.end = self.__parse_expression(PrecedenceType.P_LOWEST)
+
+        if self.__peek_token_is(TokenType.REDUCE):
+            self.__next_token()
+
+            if not self.__expect_peek(TokenType.IDENT):
+                return None
+
+            stmt.reduction = self.current_token.literal
+
+        if not self.__expect_peek(TokenType.LBRACE):
+            return None
+
+        stmt.body = self.__parse_block_statement()
+
+        return stmt
+
+    def __parse_import_statement(self) -> ImportStatement:
+        if not self.__expect_peek(TokenType.STRING):
+            return None
+
+        stmt: ImportStatement = ImportStatement(path=self.current_token.literal)
+
+        if not self.__expect_peek(TokenType.SEMICOLON):
+            return None
+
+        return stmt
+
     def __parse_expression(self, precedence: PrecedenceType) -> Expression:
         prefix_fn: Callable | None = self.prefix_parse_fns.get(self.current_token.type)
         if prefix_fn is None:
@@ -364,6 +461,21 @@ class Parser:
 
         return expr
 
+    def __parse_index_expression(self, array: Expression) -> IndexExpression:
+        expr: IndexExpression = IndexExpression(array=array)
+
+        self.__next_token()
+
+        expr.index = self.__parse_expression(PrecedenceType.P_LOWEST)
+
+        if not self.__expect_peek(TokenType.RBRACKET):
+            return None
+
+        return expr
+
+    def __parse_array_literal(self) -> ArrayLiteral:
+        return ArrayLiteral(elements=self.__parse_expression_list(TokenType.RBRACKET))
+
     def __parse_expression_list(self, end) -> list[Expression]:
         e_list: list[Expression] = []
 
@@ -413,3 +525,42 @@ class Parser:
 
     def __parse_boolean(self) -> BooleanLiteral:
         return BooleanLiteral(value=self.__current_token_is(TokenType.TRUE))
+
+    def __parse_string_literal(self) -> StringLiteral:
+        return StringLiteral(value=self.current_token.literal)
+
+
+def stream_program(code: str) -> Iterator[Statement]:
+    parser = Parser(lexer=Lexer(code=code))
+
+    for stmt in parser.statements():
+        if len(parser.errors) == 0:
+            yield stmt
+
+    if len(parser.errors) > 0:
+        raise CompileError(parser.errors)
+
+
+def scan_imports(code: str) -> list[str]:
+    lexer = Lexer(code=code)
+
+    paths: list[str] = []
+    previous: TokenType | None = None
+    while True:
+        token = lexer.next_token()
+        if token.type == TokenType.EOF:
+            return paths
+        if previous == TokenType.IMPORT and token.type == TokenType.STRING and token.literal not in paths:
+            paths.append(token.literal)
+        previous = token.type
+
+
+def parse_program(code: str) -> Program:
+    lexer = Lexer(code=code)
+    parser = Parser(lexer=lexer)
+    program = parser.parse_program()
+
+    if len(parser.errors) > 0:
+        raise CompileError(parser.errors)
+
+    return program
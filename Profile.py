@@ -0,0 +1,119 @@
+import json
+import os
+
+
+PROFILE_VERSION: int = 1
+
+HOT_RATIO: float = 0.1
+
+MAX_BRANCH_WEIGHT: int = 2 ** 31 - 1
+
+TIMING_PREFIX: str = "__timing."
+TIMING_CALLEE: str = "__timing.callee.total"
+TIMING_FIELDS: list[str] = ['calls', 'cycles', 'self_cycles', 'depth']
+
+
+def counters_name(function: str) -> str:
+    return f"__prof.{function}"
+
+
+def counters_size(branches: int) -> int:
+    return 1 + 2 * branches
+
+
+def timing_name(function: str) -> str:
+    return f"{TIMING_PREFIX}{function}"
+
+
+def is_timing_table(name: str) -> bool:
+    return name.startswith(TIMING_PREFIX) and name != TIMING_CALLEE
+
+
+def timing_to_flat_profile(tables: dict[str, list[int]]) -> list[dict]:
+    total = sum(values[2] for values in tables.values())
+
+    rows = []
+    for name, (calls, cycles, self_cycles, _) in tables.items():
+        if calls == 0:
+            continue
+
+        rows.append({
+            "function": name,
+            "calls": calls,
+            "cycles": cycles,
+            "self_cycles": self_cycles,
+            "self_percent": 100.0 * self_cycles / total if total > 0 else 0.0,
+            "cycles_per_call": cycles / calls
+        })
+
+    rows.sort(key=lambda row: -row["self_cycles"])
+    return rows
+
+
+def format_flat_profile(rows: list[dict]) -> str:
+    lines = [f"{'self %':>7} {'self cycles':>14} {'cycles':>14} {'calls':>12} {'cycles/call':>12}  function"]
+    for row in rows:
+        lines.append(f"{row['self_percent']:7.2f} {row['self_cycles']:14d} {row['cycles']:14d} {row['calls']:12d} "
+                     f"{row['cycles_per_call']:12.1f}  {row['function']}")
+
+    return "\n".join(lines)
+
+
+def counters_to_profile(counters: dict[str, list[int]]) -> dict:
+    functions = {}
+    for name, values in counters.items():
+        functions[name] = {
+            "entries": values[0],
+            "branches": [[values[1 + 2 * i], values[2 + 2 * i]] for i in range((len(values) - 1) // 2)]
+        }
+
+    return {"version": PROFILE_VERSION, "functions": functions}
+
+
+def save_profile(profile: dict, path: str) -> None:
+    with open(path, "w") as profile_file:
+        json.dump(profile, profile_file, indent=4)
+
+
+def load_profile(path: str) -> dict:
+    with open(path, "r") as profile_file:
+        profile = json.load(profile_file)
+
+    if profile.get("version") != PROFILE_VERSION:
+        raise ValueError(f"Unsupported profile version in {path}")
+
+    return profile
+
+
+def write_perf_map(symbols: list[tuple[int, int, str]], pid: int = None) -> str:
+    path = f"/tmp/perf-{pid if pid is not None else os.getpid()}.map"
+
+    with open(path, "a") as map_file:
+        for address, size, name in symbols:
+            map_file.write(f"{address:x} {size:x} {name}\n")
+
+    return path
+
+
+def function_heat(profile: dict, name: str) -> str | None:
+    functions = profile.get("functions", {})
+    if name not in functions:
+        return None
+
+    max_entries = max(f["entries"] for f in functions.values())
+    entries = functions[name]["entries"]
+
+    if entries == 0:
+        return 'cold'
+    if entries >= max_entries * HOT_RATIO:
+        return 'hot'
+    return None
+
+
+def branch_weights(taken: int, not_taken: int) -> list[int] | None:
+    if taken == 0 and not_taken == 0:
+        return None
+
+    scale = max(1, -(-max(taken, not_taken) // MAX_BRANCH_WEIGHT))
+
+    return [taken // scale, not_taken // scale]
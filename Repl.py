@@ -0,0 +1,360 @@
+from Parser import parse_program
+from CodeGen import Compiler
+from Linker import UnitCache
+from Target import TargetSpec
+from Analysis import FunctionInfo, analyze_function, MATH_BUILTINS, builtin_return_type
+from Engine import CTYPES_MAP, FLUSH_CALLBACK
+from Output import OUTPUT_BUFFER, OUTPUT_LENGTH, OUTPUT_FLUSH, RECORD_SIZE, decode_records, format_value
+from Parallel import ParallelRunner, PARALLEL_RUN, PARALLEL_WORKERS
+from MappedFile import MappedFiles, MMAP_OPEN
+from Errors import CompileError
+
+from AST import NodeType, Expression
+from AST import FunctionStatement, BlockStatement, ReturnStatement, ExpressionStatement, ImportStatement
+from AST import IdentifierLiteral, IntegerLiteral
+
+from typing import Any, BinaryIO
+from ctypes import CFUNCTYPE, c_int, c_void_p, cast, string_at
+
+import argparse
+import io
+import os
+import sys
+
+import llvmlite.binding as llvm
+
+
+SESSION_IMPORT: str = "<session>"
+ENTRY_PREFIX: str = "__repl."
+
+PROMPT: str = ">>> "
+CONTINUATION: str = "... "
+
+COMPARISONS: set[str] = {'<', '<=', '>', '>=', '==', '!='}
+
+LOCAL_LINKAGES: set[llvm.Linkage] = {llvm.Linkage.internal, llvm.Linkage.private}
+
+
+class SessionScope:
+    def __init__(self, signatures: dict[str, tuple[list[str], str]], function_info: dict[str, FunctionInfo]) -> None:
+        self.signatures = signatures
+        self.function_info = function_info
+
+
+def expression_type(node: Expression, signatures: dict[str, tuple[list[str], str]]) -> str | None:
+    match node.type():
+        case NodeType.IntegerLiteral:
+            return 'int'
+        case NodeType.FloatLiteral:
+            return 'float'
+        case NodeType.BooleanLiteral:
+            return 'bool'
+        case NodeType.ArrayLiteral:
+            element_type = expression_type(node.elements[0], signatures) if len(node.elements) > 0 else None
+            return f"{element_type}[]" if element_type is not None else None
+        case NodeType.IndexExpression:
+            array_type = expression_type(node.array, signatures)
+            return array_type[:-2] if array_type is not None and array_type.endswith('[]') else None
+        case NodeType.InfixExpression:
+            if node.operator in COMPARISONS:
+                return 'bool'
+            return expression_type(node.left_node, signatures)
+        case NodeType.CallExpression:
+            name: str = node.function.value
+            if name == 'len':
+                return 'int'
+            if name in MATH_BUILTINS:
+                return_type, _ = builtin_return_type(name, [expression_type(arg, signatures) for arg in node.arguments])
+                return return_type
+            if name in signatures:
+                return signatures[name][1]
+    return None
+
+
+class ReplSession:
+    def __init__(self, target: TargetSpec = None, opt_level: int = 0, use_disk: bool = True,
+                 output: BinaryIO = None) -> None:
+        self.cache = UnitCache(target=target, use_disk=use_disk)
+        self.target: TargetSpec = self.cache.target
+        self.opt_level = opt_level
+
+        self.signatures: dict[str, tuple[list[str], str]] = {}
+        self.function_info: dict[str, FunctionInfo] = {}
+
+        self.symbols: set[str] = set()
+        self.runtime_loaded: bool = False
+        self.entries: int = 0
+
+        self.stdout: BinaryIO = output if output is not None else io.BytesIO()
+        self.flush_callback = None
+        self.parallel_runner: ParallelRunner | None = None
+        self.files = MappedFiles()
+        self.files_bound: bool = False
+
+        module = llvm.parse_assembly("")
+        module.triple = llvm.get_default_triple()
+        module.data_layout = self.cache.data_layout
+        self.engine: llvm.ExecutionEngine = llvm.create_mcjit_compiler(module, self.target.create_target_machine())
+
+    def load(self, path: str) -> list[str]:
+        unit = self.cache.compile_file(path)
+
+        signatures = self.cache.signatures(unit)
+        self.__check_defined(list(signatures))
+
+        module = self.cache.link(unit)
+        self.__optimize(module)
+        self.__add(module)
+
+        self.signatures.update(signatures)
+        self.function_info.update(self.cache.function_info(unit))
+
+        return sorted(signatures)
+
+    def evaluate(self, code: str) -> list[tuple[str | None, Any]]:
+        program = parse_program(code)
+
+        functions: list[FunctionStatement] = []
+        expressions: list[Expression] = []
+        for stmt in program.statements:
+            match stmt.type():
+                case NodeType.ImportStatement:
+                    self.load(stmt.path)
+                case NodeType.FunctionStatement:
+                    functions.append(stmt)
+                case NodeType.ExpressionStatement if stmt.expr.type() != NodeType.IfStatement:
+                    expressions.append(stmt.expr)
+                case _:
+                    raise CompileError([f"Statement {stmt.type()} is not supported at the top level"])
+
+        self.__check_defined([function.name.value for function in functions])
+
+        signatures = {**self.cache.runtime_unit().signatures, **self.signatures}
+        for function in functions:
+            signatures[function.name.value] = ([p.value_type for p in function.parameters], function.return_type)
+
+        entries = [self.__entry(expr, signatures) for expr in expressions]
+
+        statements = functions + [function for function, _ in entries]
+        if len(statements) > 0:
+            self.__compile(statements)
+
+        results = []
+        for function, value_type in entries:
+            value = self.__call(function.name.value, value_type if value_type is not None else 'int')
+            results.append((value_type, value if value_type is not None else None))
+
+        self.flush_output()
+        return results
+
+    def __check_defined(self, names: list[str]) -> None:
+        runtime = self.cache.runtime_unit().signatures
+        defined = [name for name in names if name in self.signatures or name in self.symbols or name in runtime]
+        if len(defined) > 0:
+            raise CompileError([f"Function {name} is already defined" for name in defined])
+
+    def __entry(self, expr: Expression, signatures: dict) -> tuple[FunctionStatement, str | None]:
+        name = f"{ENTRY_PREFIX}{self.entries}"
+        self.entries += 1
+
+        if expr.type() == NodeType.CallExpression and expr.function.value == 'print':
+            body = [ExpressionStatement(expr=expr), ReturnStatement(return_value=IntegerLiteral(value=0))]
+            value_type = None
+        else:
+            value_type = expression_type(expr, signatures)
+            if value_type is None:
+                raise CompileError([f"Cannot infer the type of the expression {expr.type().value}"])
+            body = [ReturnStatement(return_value=expr)]
+
+        function = FunctionStatement(parameters=[], body=BlockStatement(statements=body),
+                                     name=IdentifierLiteral(value=name),
+                                     return_type=value_type if value_type is not None else 'int')
+        return function, value_type
+
+    def __compile(self, statements: list[FunctionStatement]) -> None:
+        calls: set[str] = set()
+        for stmt in statements:
+            calls |= analyze_function(stmt, {}).calls
+
+        visible = [name for name in sorted(calls) if name in self.signatures]
+        scope = SessionScope({name: self.signatures[name] for name in visible},
+                             {name: self.function_info[name] for name in visible})
+
+        compiler = Compiler(cpu_name=self.target.cpu_name(), cpu_features=self.target.feature_string(),
+                            imports={SESSION_IMPORT: scope}, runtime=self.cache.runtime_unit)
+        compiler.compile(ImportStatement(path=SESSION_IMPORT))
+        for stmt in statements:
+            compiler.compile(stmt)
+
+        if len(compiler.errors) > 0:
+            raise CompileError(compiler.errors)
+
+        compiler.module.triple = llvm.get_default_triple()
+        compiler.module.data_layout = self.cache.data_layout
+
+        module = llvm.parse_assembly(str(compiler.module))
+        module.verify()
+
+        if compiler.runtime_unit is not None and not self.runtime_loaded:
+            runtime = compiler.runtime_unit.llvm_module().clone()
+            self.__optimize(runtime)
+            self.__add(runtime)
+            self.runtime_loaded = True
+
+        self.__optimize(module)
+        self.__add(module)
+
+        for name, signature in compiler.signatures.items():
+            if not name.startswith(ENTRY_PREFIX):
+                self.signatures[name] = signature
+                self.function_info[name] = compiler.function_info[name]
+
+    def __optimize(self, module: llvm.ModuleRef) -> None:
+        pass_manager = self.cache.pass_manager(self.opt_level)
+        if pass_manager is not None:
+            pass_manager.run(module)
+
+    def __add(self, module: llvm.ModuleRef) -> None:
+        values = [value for value in list(module.functions) + list(module.global_variables)
+                  if not value.is_declaration and value.linkage not in LOCAL_LINKAGES]
+
+        defined = [value.name for value in values
+                   if value.name in self.symbols and value.linkage != llvm.Linkage.linkonce_odr]
+        if len(defined) > 0:
+            raise CompileError([f"Symbol {name} is already defined" for name in defined])
+
+        for value in values:
+            if value.name in self.symbols:
+                value.linkage = 'available_externally'
+            else:
+                self.symbols.add(value.name)
+
+        self.engine.add_module(module)
+        self.engine.finalize_object()
+
+        self.__bind_output()
+        self.__bind_parallel()
+        self.__bind_files()
+
+    def __bind_output(self) -> None:
+        if self.flush_callback is not None or OUTPUT_FLUSH not in self.symbols:
+            return
+
+        self.flush_callback = FLUSH_CALLBACK(self.__write_records)
+        address = self.engine.get_global_value_address(OUTPUT_FLUSH)
+        c_void_p.from_address(address).value = cast(self.flush_callback, c_void_p).value
+
+    def __bind_parallel(self) -> None:
+        if self.parallel_runner is not None or PARALLEL_RUN not in self.symbols or PARALLEL_WORKERS <= 1:
+            return
+
+        self.parallel_runner = ParallelRunner()
+        address = self.engine.get_global_value_address(PARALLEL_RUN)
+        c_void_p.from_address(address).value = cast(self.parallel_runner.callback, c_void_p).value
+
+    def __bind_files(self) -> None:
+        if self.files_bound or MMAP_OPEN not in self.symbols:
+            return
+
+        address = self.engine.get_global_value_address(MMAP_OPEN)
+        c_void_p.from_address(address).value = cast(self.files.callback, c_void_p).value
+        self.files_bound = True
+
+    def __write_records(self, data: int, count: int) -> None:
+        self.stdout.write(decode_records(string_at(data, count * RECORD_SIZE)))
+
+    def __call(self, name: str, value_type: str) -> Any:
+        cfunc = CFUNCTYPE(CTYPES_MAP[value_type])(self.engine.get_function_address(name))
+        try:
+            return cfunc()
+        finally:
+            self.files.release()
+            self.files.check()
+
+    def flush_output(self) -> None:
+        if self.flush_callback is None:
+            return
+
+        length = c_int.from_address(self.engine.get_global_value_address(OUTPUT_LENGTH))
+        if length.value > 0:
+            self.__write_records(self.engine.get_global_value_address(OUTPUT_BUFFER), length.value)
+            length.value = 0
+
+        self.stdout.flush()
+
+    def close(self) -> None:
+        self.files.release()
+
+        if self.parallel_runner is not None:
+            self.parallel_runner.close()
+            self.parallel_runner = None
+
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+    def __str__(self):
+        return f"ReplSession[{len(self.signatures)} functions : {self.entries} entries]"
+
+    def __repr__(self):
+        return str(self)
+
+
+def read_entry() -> str | None:
+    lines: list[str] = []
+    depth = 0
+
+    while True:
+        try:
+            line = input(PROMPT if len(lines) == 0 else CONTINUATION)
+        except EOFError:
+            return None
+
+        lines.append(line)
+        depth += line.count('{') - line.count('}')
+        if depth <= 0:
+            return "\n".join(lines)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Interactive session on a single growing JIT engine")
+    arg_parser.add_argument("programs", nargs="*", help="programs to load before the first prompt")
+    arg_parser.add_argument("-O", dest="opt_level", type=int, default=0, choices=[0, 1, 2, 3])
+    args = arg_parser.parse_args()
+
+    session = ReplSession(opt_level=args.opt_level, output=sys.stdout.buffer)
+    for path in args.programs:
+        print(f"{os.path.basename(path)}: {', '.join(session.load(path))}")
+
+    while True:
+        entry = read_entry()
+        if entry is None or entry.strip() in (":q", ":quit"):
+            break
+
+        if entry.strip() == "":
+            continue
+
+        if entry.strip() == ":functions":
+            for name, (param_types, return_type) in sorted(session.signatures.items()):
+                print(f"{name}({', '.join(param_types)}) @ {return_type}")
+            continue
+
+        try:
+            results = session.evaluate(entry)
+        except CompileError as e:
+            print("\n".join(e.errors))
+            continue
+        except OSError as e:
+            print(e)
+            continue
+
+        sys.stdout.flush()
+        for value_type, value in results:
+            if value_type is not None:
+                print(format_value(value_type, value))
+
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from contextlib import contextmanager, nullcontext
+
+import re
+import time
+
+import llvmlite.binding as llvm
+
+
+PASS_TIME_PATTERN: re.Pattern = re.compile(r"([\d.]+) \(\s*[\d.]+%\)")
+PASS_INSTANCE_PATTERN: re.Pattern = re.compile(r" #\d+$")
+
+FUNCTION_STAGES: list[str] = ['before', 'after']
+FUNCTION_METRICS: list[str] = ['instructions', 'blocks', 'allocas']
+
+TOP_PASSES: int = 15
+
+
+def function_stats(module: llvm.ModuleRef) -> dict[str, dict[str, int]]:
+    stats = {}
+    for function in module.functions:
+        if function.is_declaration:
+            continue
+
+        blocks = instructions = allocas = 0
+        for block in function.blocks:
+            blocks += 1
+            for instruction in block.instructions:
+                instructions += 1
+                if instruction.opcode == 'alloca':
+                    allocas += 1
+
+        stats[function.name] = {"instructions": instructions, "blocks": blocks, "allocas": allocas}
+
+    return stats
+
+
+def parse_pass_timings(text: str) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    for line in text.splitlines():
+        times = PASS_TIME_PATTERN.findall(line)
+        if len(times) == 0 or "%)" not in line:
+            continue
+
+        name = PASS_INSTANCE_PATTERN.sub("", line.rsplit("%)", 1)[1].strip())
+        if name in ("", "Total"):
+            continue
+
+        timings[name] = timings.get(name, 0.0) + float(times[-1])
+
+    return timings
+
+
+class CompileReport:
+    def __init__(self) -> None:
+        self.phases: dict[str, int] = {}
+        self.functions: dict[str, dict[str, dict[str, int]]] = {}
+        self.passes: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        st = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter_ns() - st
+
+    @contextmanager
+    def pass_timing(self):
+        llvm.set_time_passes(True)
+        try:
+            yield
+        finally:
+            for name, seconds in parse_pass_timings(llvm.report_and_reset_timings()).items():
+                self.passes[name] = self.passes.get(name, 0.0) + seconds
+            llvm.set_time_passes(False)
+
+    def record_functions(self, module: llvm.ModuleRef, stage: str) -> None:
+        for name, stats in function_stats(module).items():
+            self.functions.setdefault(name, {})[stage] = stats
+
+    def json(self) -> dict:
+        return {
+            "phases_ns": dict(sorted(self.phases.items(), key=lambda item: -item[1])),
+            "functions": dict(sorted(self.functions.items(), key=lambda item: -self.__size(item[1]))),
+            "passes_s": dict(sorted(self.passes.items(), key=lambda item: -item[1]))
+        }
+
+    def table(self, top_passes: int = TOP_PASSES) -> str:
+        lines = [f"{'phase':<32} {'ms':>10}"]
+        for name, ns in sorted(self.phases.items(), key=lambda item: -item[1]):
+            lines.append(f"{name:<32} {ns / 1e6:10.3f}")
+
+        lines.append("")
+        lines.append(f"{'function':<32} " + " ".join(f"{metric[:5] + ' ' + stage[0]:>9}"
+                                                     for metric in FUNCTION_METRICS for stage in FUNCTION_STAGES))
+        for name, stages in sorted(self.functions.items(), key=lambda item: -self.__size(item[1])):
+            lines.append(f"{name:<32} " + " ".join(f"{stages.get(stage, {}).get(metric, '-'):>9}"
+                                                   for metric in FUNCTION_METRICS for stage in FUNCTION_STAGES))
+
+        if len(self.passes) > 0:
+            lines.append("")
+            lines.append(f"{'pass':<56} {'ms':>10}")
+            for name, seconds in sorted(self.passes.items(), key=lambda item: -item[1])[:top_passes]:
+                lines.append(f"{name[:56]:<56} {seconds * 1e3:10.3f}")
+
+        return "\n".join(lines)
+
+    def __size(self, stages: dict[str, dict[str, int]]) -> int:
+        return max(stats["instructions"] for stats in stages.values())
+
+    def __str__(self):
+        return f"CompileReport[{len(self.functions)} functions : {sum(self.phases.values()) / 1e6:.3f} ms]"
+
+    def __repr__(self):
+        return str(self)
+
+
+def phase(report: CompileReport | None, name: str):
+    return report.phase(name) if report is not None else nullcontext()
+
+
+def pass_timing(report: CompileReport | None):
+    return report.pass_timing() if report is not None else nullcontext()
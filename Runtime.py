@@ -0,0 +1,20 @@
+import functools
+import hashlib
+import os
+
+
+RUNTIME_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runtime")
+RUNTIME_PATH: str = os.path.join(RUNTIME_DIR, "runtime.txt")
+
+
+def is_runtime(path: str | None) -> bool:
+    return path is not None and os.path.abspath(path) == RUNTIME_PATH
+
+
+@functools.cache
+def runtime_digest() -> str:
+    try:
+        with open(RUNTIME_PATH, "rb") as runtime_file:
+            return hashlib.sha256(runtime_file.read()).hexdigest()
+    except OSError:
+        return ""
@@ -0,0 +1,62 @@
+import functools
+
+import llvmlite.binding as llvm
+
+
+@functools.cache
+def initialize_llvm() -> None:
+    llvm.initialize()
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+
+
+@functools.cache
+def host_cpu() -> tuple[str, str]:
+    return llvm.get_host_cpu_name(), llvm.get_host_cpu_features().flatten()
+
+
+class TargetSpec:
+    def __init__(self, cpu: str = "host", features: list[str] | str | None = None, opt: int = 2) -> None:
+        self.cpu = cpu
+        self.features = features
+        self.opt = opt
+
+    def cpu_name(self) -> str:
+        if self.cpu == "host":
+            return host_cpu()[0]
+        return self.cpu
+
+    def feature_string(self) -> str:
+        if self.features is None:
+            return host_cpu()[1] if self.cpu == "host" else ""
+        if isinstance(self.features, str):
+            return self.features
+        return ",".join(self.features)
+
+    def create_target_machine(self, jit: bool = True) -> llvm.TargetMachine:
+        initialize_llvm()
+
+        target = llvm.Target.from_default_triple()
+        return target.create_target_machine(cpu=self.cpu_name(), features=self.feature_string(), opt=self.opt,
+                                            reloc='default' if jit else 'pic',
+                                            codemodel='jitdefault' if jit else 'default')
+
+    def __str__(self) -> str:
+        return f"TargetSpec[{self.cpu_name()} : {self.feature_string()}]"
+
+
+def create_pass_manager(target_machine: llvm.TargetMachine, opt_level: int) -> llvm.ModulePassManager | None:
+    if opt_level <= 0:
+        return None
+
+    pass_manager_builder = llvm.PassManagerBuilder()
+    pass_manager_builder.opt_level = opt_level
+    pass_manager_builder.loop_vectorize = opt_level >= 2
+    pass_manager_builder.slp_vectorize = opt_level >= 2
+    pass_manager_builder.inlining_threshold = 275 if opt_level >= 3 else 225
+
+    pass_manager = llvm.ModulePassManager()
+    target_machine.add_analysis_passes(pass_manager)
+    pass_manager_builder.populate(pass_manager)
+
+    return pass_manager
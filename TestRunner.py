@@ -0,0 +1,317 @@
+from Engine import Engine, BACKENDS
+from Interpreter import Interpreter, INTERPRETER_BACKEND
+from Linker import UnitCache
+
+from multiprocessing.connection import Connection, wait
+
+import argparse
+import glob
+import json
+import math
+import multiprocessing
+import os
+import time
+import traceback
+
+
+TESTS_GLOB: str = "tests/*.txt"
+EXPECTED_SUFFIX: str = ".expected"
+
+RUNNER_BACKENDS: list[str] = BACKENDS + [INTERPRETER_BACKEND]
+
+TIMEOUT: float = 10.0
+REFUSED_STATUSES: set[str] = {"timeout"}
+FLOAT_REL_TOL: float = 1e-6
+
+
+def expected_path(path: str) -> str:
+    return os.path.splitext(path)[0] + EXPECTED_SUFFIX
+
+
+def load_expected(path: str) -> dict | None:
+    try:
+        with open(expected_path(path), "r") as expected_file:
+            return json.load(expected_file)
+    except OSError:
+        return None
+
+
+def save_expected(path: str, outcome: dict) -> None:
+    previous = load_expected(path) or {}
+
+    expected = {"status": outcome["status"]}
+    if outcome["status"] == "ok":
+        expected["result"] = outcome["result"]
+    if "output" in outcome:
+        expected["output"] = outcome["output"]
+    if "attributes" in previous:
+        attributes = outcome.get("attributes", previous["attributes"])
+        expected["attributes"] = {name: attributes.get(name) for name in previous["attributes"]}
+
+    with open(expected_path(path), "w") as expected_file:
+        json.dump(expected, expected_file, indent=4)
+        expected_file.write("\n")
+
+
+def matches(expected: dict, outcome: dict) -> bool:
+    if expected.get("status", "ok") != outcome["status"]:
+        return False
+    if outcome["status"] != "ok":
+        return True
+
+    if expected.get("output", "") != outcome.get("output", ""):
+        return False
+
+    if "attributes" in expected and "attributes" in outcome:
+        if any(outcome["attributes"].get(name) != attrs for name, attrs in expected["attributes"].items()):
+            return False
+
+    want, got = expected.get("result"), outcome["result"]
+    if isinstance(want, float) or isinstance(got, float):
+        return math.isclose(want, got, rel_tol=FLOAT_REL_TOL)
+    return want == got
+
+
+def run_test(path: str, cache: UnitCache, backend: str = 'jit', opt_level: int = 0) -> dict:
+    with open(path, "r") as file:
+        code = file.read()
+
+    st = time.perf_counter_ns()
+    try:
+        if backend == INTERPRETER_BACKEND:
+            engine = Interpreter(code=code, path=path, tier_up=False)
+        else:
+            engine = Engine(code=code, path=path, cache=cache, opt_level=opt_level, backend=backend)
+    except Exception as e:
+        return {"status": "error", "error": str(e), "compile_ns": time.perf_counter_ns() - st}
+    compile_ns = time.perf_counter_ns() - st
+
+    cfunc = engine.function('main')
+
+    st = time.perf_counter_ns()
+    result = cfunc()
+    run_ns = time.perf_counter_ns() - st
+
+    engine.unmap_files()
+
+    outcome = {"status": "ok", "result": result, "compile_ns": compile_ns, "run_ns": run_ns}
+
+    output = engine.output()
+    if len(output) > 0:
+        outcome["output"] = output.decode()
+
+    if backend != INTERPRETER_BACKEND:
+        outcome["attributes"] = {name: info.attributes() for name, info in engine.function_info.items()}
+
+    return outcome
+
+
+def worker_loop(connection: Connection, use_disk: bool, backend: str, opt_level: int) -> None:
+    cache = UnitCache(use_disk=use_disk)
+
+    while True:
+        path = connection.recv()
+        if path is None:
+            return
+
+        try:
+            outcome = run_test(path, cache, backend, opt_level)
+        except Exception:
+            outcome = {"status": "error", "error": traceback.format_exc(limit=1).strip()}
+
+        connection.send(outcome)
+
+
+class Worker:
+    def __init__(self, context: multiprocessing.context.BaseContext, use_disk: bool, backend: str,
+                 opt_level: int) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=worker_loop, args=(child_connection, use_disk, backend, opt_level),
+                                       daemon=True)
+        self.process.start()
+        child_connection.close()
+
+        self.path: str | None = None
+        self.started: float = 0.0
+
+    def submit(self, path: str) -> None:
+        self.path = path
+        self.started = time.monotonic()
+        self.connection.send(path)
+
+    def finish(self) -> tuple[str, float]:
+        path, elapsed = self.path, time.monotonic() - self.started
+        self.path = None
+        return path, elapsed
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def close(self) -> None:
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class TestPool:
+    def __init__(self, workers: int = None, timeout: float = TIMEOUT, use_disk: bool = True,
+                 backend: str = 'jit', opt_level: int = 0) -> None:
+        self.context = multiprocessing.get_context("spawn")
+        self.size = workers if workers is not None else os.cpu_count() or 1
+        self.timeout = timeout
+        self.use_disk = use_disk
+        self.backend = backend
+        self.opt_level = opt_level
+
+        self.workers: list[Worker] = []
+
+    def run(self, paths: list[str]):
+        pending = list(reversed(paths))
+
+        self.workers = [Worker(self.context, self.use_disk, self.backend, self.opt_level)
+                        for _ in range(min(self.size, len(paths)))]
+        try:
+            for worker in self.workers:
+                if pending:
+                    worker.submit(pending.pop())
+
+            while any(worker.path is not None for worker in self.workers):
+                busy = [worker for worker in self.workers if worker.path is not None]
+
+                now = time.monotonic()
+                deadline = min(worker.started for worker in busy) + self.timeout
+                ready = wait([w.connection for w in busy] + [w.process.sentinel for w in busy],
+                             timeout=max(0.0, deadline - now))
+
+                for i, worker in enumerate(self.workers):
+                    if worker.path is None:
+                        continue
+
+                    outcome = None
+                    if worker.connection in ready:
+                        try:
+                            outcome = worker.connection.recv()
+                        except (EOFError, OSError):
+                            outcome = None
+                    if outcome is None and (worker.process.sentinel in ready or not worker.process.is_alive()):
+                        outcome = {"status": "crash", "exitcode": worker.process.exitcode}
+                    if outcome is None and time.monotonic() - worker.started >= self.timeout:
+                        outcome = {"status": "timeout"}
+                    if outcome is None:
+                        continue
+
+                    path, elapsed = worker.finish()
+                    outcome["wall_ns"] = int(elapsed * 1e9)
+
+                    if outcome["status"] in ("crash", "timeout"):
+                        worker.kill()
+                        worker = self.workers[i] = Worker(self.context, self.use_disk, self.backend, self.opt_level)
+
+                    if pending:
+                        worker.submit(pending.pop())
+
+                    yield path, outcome
+        finally:
+            for worker in self.workers:
+                if worker.path is not None:
+                    worker.kill()
+                else:
+                    worker.close()
+            self.workers = []
+
+
+def run_tests(paths: list[str], workers: int = None, timeout: float = TIMEOUT, update: bool = False,
+              use_disk: bool = True, backend: str = 'jit', opt_level: int = 0) -> dict:
+    results = []
+    pool = TestPool(workers=workers, timeout=timeout, use_disk=use_disk, backend=backend, opt_level=opt_level)
+    for path, outcome in pool.run(paths):
+        expected = load_expected(path)
+
+        if update and outcome["status"] != "error" and outcome["status"] not in REFUSED_STATUSES:
+            save_expected(path, outcome)
+            verdict = "updated"
+        elif expected is None:
+            verdict = "missing"
+        elif expected.get("status", "ok") in REFUSED_STATUSES:
+            verdict = "invalid"
+        else:
+            verdict = "pass" if matches(expected, outcome) else "fail"
+
+        result = {"program": path, "verdict": verdict, "expected": expected, **outcome}
+        results.append(result)
+
+        print_result(result)
+
+    results.sort(key=lambda r: r["program"])
+
+    summary = {}
+    for result in results:
+        summary[result["verdict"]] = summary.get(result["verdict"], 0) + 1
+
+    return {"summary": summary, "results": results}
+
+
+def print_result(result: dict) -> None:
+    line = f"{result['verdict'].upper():<8} {result['program']:<32} {result['status']:<8}"
+
+    if "compile_ns" in result:
+        line += f" compile {result['compile_ns'] / 1e6:9.3f} ms"
+    if "run_ns" in result:
+        line += f"  run {result['run_ns'] / 1e6:9.3f} ms"
+    if "result" in result:
+        line += f"  result {result['result']}"
+    if result["verdict"] == "fail" and result["expected"] is not None:
+        line += f"  expected {result['expected'].get('result', result['expected'].get('status'))}"
+        attributes = result.get("attributes", {})
+        differing = [name for name, attrs in result["expected"].get("attributes", {}).items()
+                     if attributes.get(name, attrs) != attrs]
+        if len(differing) > 0:
+            line += f"  attributes differ for {', '.join(differing)}"
+    if result["verdict"] == "invalid":
+        line += f"  expected status {result['expected']['status']} is not accepted"
+    if "error" in result:
+        line += f"  {result['error']}"
+
+    print(line)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Run test programs in parallel and check their results")
+    arg_parser.add_argument("programs", nargs="*", default=None)
+    arg_parser.add_argument("-j", "--workers", type=int, default=None)
+    arg_parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    arg_parser.add_argument("--backend", default='jit', choices=RUNNER_BACKENDS)
+    arg_parser.add_argument("-O", dest="opt_level", type=int, default=0, choices=[0, 1, 2, 3])
+    arg_parser.add_argument("--update", action="store_true", help="rewrite expectation files from actual results")
+    arg_parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk unit cache")
+    arg_parser.add_argument("--output", default=None, help="write the report as JSON")
+    args = arg_parser.parse_args()
+
+    paths = args.programs if args.programs else sorted(glob.glob(TESTS_GLOB))
+
+    st = time.perf_counter_ns()
+    report = run_tests(paths, workers=args.workers, timeout=args.timeout, update=args.update,
+                       use_disk=not args.no_cache, backend=args.backend, opt_level=args.opt_level)
+    elapsed = time.perf_counter_ns() - st
+
+    print(f"{len(paths)} programs in {elapsed / 1e9:.3f} s: "
+          + ", ".join(f"{count} {verdict}" for verdict, count in sorted(report["summary"].items())))
+
+    if args.output:
+        with open(args.output, "w") as report_file:
+            json.dump(report, report_file, indent=4)
+
+    failed = sum(report["summary"].get(verdict, 0) for verdict in ("fail", "missing", "invalid"))
+    exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ class TokenType(Enum):
     IDENT = "IDENT"
     INT = "INT"
     FLOAT = "FLOAT"
+    STRING = "STRING"
 
     SUM = "SUM"
     SUB = "SUB"
@@ -32,6 +33,8 @@ class TokenType(Enum):
     AT = "AT"
     LBRACE = "LBRACE"
     RBRACE = "RBRACE"
+    LBRACKET = "LBRACKET"
+    RBRACKET = "RBRACKET"
 
     PLUS_PLUS = "PLUS_PLUS"
     MINUS_MINUS = "MINUS_MINUS"
@@ -42,19 +45,23 @@ class TokenType(Enum):
     IF = "IF"
     WHILE = "WHILE"
     FOR = "FOR"
+    PARALLEL = "PARALLEL"
+    REDUCE = "REDUCE"
     ELSE = "ELSE"
     TRUE = "TRUE"
     FALSE = "FALSE"
+    IMPORT = "IMPORT"
 
     TYPE = "TYPE"
 
 
 class Token:
-    def __init__(self, type: TokenType, literal: Any, line: int, pos: int) -> None:
+    def __init__(self, type: TokenType, literal: Any, line: int, pos: int, column: int = 0) -> None:
         self.pos = pos
         self.type = type
         self.literal = literal
         self.line = line
+        self.column = column
 
     def __str__(self):
         return f"Token[{self.type} : {self.literal} : Line {self.line} : Pos {self.pos}]"
@@ -70,12 +77,15 @@ KEYWORDS: dict[str, TokenType] = {
     "if": TokenType.IF,
     "while": TokenType.WHILE,
     "for": TokenType.FOR,
+    "parallel": TokenType.PARALLEL,
+    "reduce": TokenType.REDUCE,
     "else": TokenType.ELSE,
     "true": TokenType.TRUE,
-    "false": TokenType.FALSE
+    "false": TokenType.FALSE,
+    "import": TokenType.IMPORT
 }
 
-TYPE_KEYWORDS: list[str] = ["int", "float"]
+TYPE_KEYWORDS: list[str] = ["int", "float", "int4", "int8", "float4", "float8"]
 
 
 def lookup_ident(ident: str) -> TokenType:
@@ -1,23 +1,28 @@
 from Lexer import Lexer
 from Parser import Parser
 from CodeGen import Compiler
+from Engine import Engine
+from Linker import UnitCache
+from Report import CompileReport
+from Profile import format_flat_profile
 from AST import Program
 
+import argparse
 import json
+import sys
 import time
 
 
 import llvmlite.binding as llvm
-from ctypes import CFUNCTYPE, c_int, c_float
 
 
-def lexer_debug():
+def lexer_debug(code: str):
     lexer = Lexer(code=code)
     while lexer.current_ch is not None:
         print(lexer.next_token())
 
 
-def parser_debug():
+def parser_debug(code: str, output_path: str):
     lexer = Lexer(code=code)
     parser = Parser(lexer=lexer)
     program: Program = parser.parse_program()
@@ -25,15 +30,13 @@ def parser_debug():
         for err in parser.errors:
             print(err)
         exit(1)
-    with open("AST.json", "w") as json_file:
+    with open(output_path, "w") as json_file:
         json.dump(program.json(), json_file, indent=4)
 
-    print("AST.json created")
+    print(f"{output_path} created")
 
 
-
-
-def code_gen_debug():
+def code_gen_debug(code: str, path: str, output_path: str):
     lexer = Lexer(code=code)
     parser = Parser(lexer=lexer)
     program = parser.parse_program()
@@ -42,67 +45,93 @@ def code_gen_debug():
         for err in parser.errors:
             print(err)
         exit(1)
-    compiler = Compiler()
+    compiler = Compiler(imports=UnitCache().compile_imports(program, path))
     compiler.compile(node=program)
 
     module = compiler.module
     module.triple = llvm.get_default_triple()
 
-    with open("code.ll", "w") as ll_file:
+    with open(output_path, "w") as ll_file:
         ll_file.write(str(module))
 
-    print("code.ll created")
-
-
-def code_debug():
-    lexer = Lexer(code=code)
-    parser = Parser(lexer=lexer)
-    program = parser.parse_program()
-
-    compiler = Compiler()
-    compiler.compile(node=program)
-
-    module = compiler.module
-    module.triple = llvm.get_default_triple()
+    print(f"{output_path} created")
 
-    llvm.initialize()
-    llvm.initialize_native_target()
-    llvm.initialize_native_asmprinter()
 
+def code_debug(code: str, path: str, opt_level: int, output_path: str = None, report: CompileReport = None,
+               timing: bool = False, stream: bool = False):
     try:
-        llvm_ir_parsed = llvm.parse_assembly(str(module))
-        llvm_ir_parsed.verify()
+        engine = Engine(code=code, path=path, opt_level=opt_level, report=report, output=sys.stdout.buffer,
+                        timing=timing, stream=stream)
     except Exception as e:
         print(e)
         raise
 
-    target_machine = llvm.Target.from_default_triple().create_target_machine()
+    if output_path is not None:
+        with open(output_path, "w") as ll_file:
+            ll_file.write(str(engine.llvm_module))
 
-    engine = llvm.create_mcjit_compiler(llvm_ir_parsed, target_machine)
-    engine.finalize_object()
+        print(f"{output_path} created")
 
-    entry = engine.get_function_address('main')
-    cfunc = CFUNCTYPE(c_int)(entry)
+    cfunc = engine.function('main')
 
-    st = time.time()
+    st = time.perf_counter_ns()
 
     result = cfunc()
 
-    end = time.time()
+    end = time.perf_counter_ns()
 
-    print(f"Output: {result}, Time: {round((end - st) * 1000, 6)} ms.")
+    sys.stdout.flush()
+    engine.flush_output()
+
+    try:
+        engine.unmap_files()
+    except OSError as e:
+        print(e)
+        raise
+
+    print(f"Output: {result}, Time: {(end - st) / 1e6} ms.")
+
+    if timing:
+        print(format_flat_profile(engine.flat_profile()))
 
 
 def main():
+    arg_parser = argparse.ArgumentParser(description="Compile and run a program")
+    arg_parser.add_argument("program", nargs="?", default="tests/test_optimizer.txt")
+    arg_parser.add_argument("--tokens", action="store_true", help="print the token stream")
+    arg_parser.add_argument("--ast", metavar="PATH", help="write the AST as JSON")
+    arg_parser.add_argument("--emit-llvm", metavar="PATH", help="write the generated LLVM IR")
+    arg_parser.add_argument("--emit-optimized", metavar="PATH", help="write the linked and optimized LLVM IR")
+    arg_parser.add_argument("-O", dest="opt_level", type=int, default=0, choices=[0, 1, 2, 3])
+    arg_parser.add_argument("--report", action="store_true", help="print compile phase, function size and pass timings")
+    arg_parser.add_argument("--report-json", metavar="PATH", help="write the compile report as JSON")
+    arg_parser.add_argument("--timing", action="store_true", help="print per-function calls and cycles after the run")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="generate code for each top-level statement as soon as it is parsed")
+    args = arg_parser.parse_args()
+
+    with open(args.program, "r") as file:
+        code = file.read()
 
-    parser_debug()
-    code_gen_debug()
-    code_debug()
+    if args.tokens:
+        lexer_debug(code)
+    if args.ast:
+        parser_debug(code, args.ast)
+    if args.emit_llvm:
+        code_gen_debug(code, args.program, args.emit_llvm)
 
+    report = CompileReport() if args.report or args.report_json else None
 
+    code_debug(code, args.program, args.opt_level, args.emit_optimized, report, args.timing, args.stream)
 
-if __name__ == "__main__":
-    with open("tests/test_optimizer.txt", "r") as file:
-        code = file.read()
+    if args.report:
+        print(report.table())
+    if args.report_json:
+        with open(args.report_json, "w") as report_file:
+            json.dump(report.json(), report_file, indent=4)
 
+        print(f"{args.report_json} created")
+
+
+if __name__ == "__main__":
     main()